@@ -1,30 +1,31 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-import csv
 import os
 import platform
 import subprocess
-from datetime import datetime
-import pandas as pd
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import A4
+from datetime import datetime, timedelta
+import importlib
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent
 
 PDF_DIR = BASE_DIR / "hasta_saglik_raporlari"
 CSV_DIR = BASE_DIR / "hasta_saglik_kayitlari"
+GECMIS_DB = CSV_DIR / "gecmis.db"
 
 PDF_DIR.mkdir(exist_ok=True)
 CSV_DIR.mkdir(exist_ok=True)
 
-# --- IMPORT KONTROLU ---
-try:
-    from modules.veri_isleme import VeriIsleyici 
-    from modules.grafikler import GrafikCizici
-except ImportError:
-    pass
-# -----------------------
+from modules import izleme
+from modules.izleme import izle
+
+# Ağır kütüphaneler (pandas, sklearn, matplotlib, reportlab) giriş ekranı açılırken
+# yüklenmez: modüller ilk kullanıldıkları yerde içe aktarılır, egitimi_baslat da
+# kullanıcı adını yazarken hepsini arka planda ısıtır.
+ARKA_PLAN_MODULLERI = ("modules.gecmis_deposu", "modules.grafikler", "modules.pdf_rapor")
 
 if platform.system() == "Windows":
     try:
@@ -32,6 +33,26 @@ if platform.system() == "Windows":
         windll.shcore.SetProcessDpiAwareness(1)
     except: pass
 
+def egitimi_baslat():
+    """VeriIsleyici'yi arka plan iş parçacığında kurar ve sonucunu bir Future olarak döner."""
+    gorev = Future()
+
+    def calis():
+        try:
+            from modules.veri_isleme import VeriIsleyici
+            gorev.set_result(VeriIsleyici())
+        except Exception as e:
+            gorev.set_exception(e)
+        # Modeller hazır olduktan sonra arayüz modülleri de önceden yüklenir
+        for ad in ARKA_PLAN_MODULLERI:
+            try:
+                importlib.import_module(ad)
+            except Exception as e:
+                print(f"Hata: {e}")
+
+    threading.Thread(target=calis, daemon=True).start()
+    return gorev
+
 class LoginPenceresi:
     def __init__(self, root):
         self.root = root
@@ -56,7 +77,7 @@ class LoginPenceresi:
             messagebox.showwarning("Uyarı", "Lütfen adınızı giriniz.")
 
 class HipertansiyonApp:
-    def __init__(self, root, kullanici_adi):
+    def __init__(self, root, kullanici_adi, egitim_gorevi=None):
         self.root = root
         
         style = ttk.Style()
@@ -67,7 +88,23 @@ class HipertansiyonApp:
         self.root.title(f"Analiz Paneli - {kullanici_adi.replace('_', ' ')}")
         self.root.geometry("1400x950") 
         self.kullanici_adi = kullanici_adi
-        self.dosya_adi = CSV_DIR / f"{self.kullanici_adi}.csv"
+
+        # Geçmiş kayıtlar tek bir SQLite dosyasında; eski CSV'ler ilk açılışta içe aktarılır
+        from modules.gecmis_deposu import GecmisDeposu
+        self.gecmis = GecmisDeposu(GECMIS_DB)
+        try:
+            self.gecmis.csv_ice_aktar(CSV_DIR)
+        except Exception as e:
+            # Eski dosyalar aktarılamasa da uygulama açılır; sonraki açılışta yeniden denenir
+            print(f"İçe aktarma hatası: {e}")
+        # Geçmiş sekmesinde en son çizilen kaydın kimliği (sonraki açılışta sadece yeniler okunur)
+        self._gecmis_son_kimlik = None
+        # Geçmiş grafiği seçenekleri: dönem adı -> gün sayısı, ayrıntı adı -> seviye
+        self.gecmis_pencereleri = {"Tümü": None, "Son 7 Gün": 7, "Son 30 Gün": 30, "Son 3 Ay": 90, "Son 1 Yıl": 365}
+        self.gecmis_seviyeleri = {
+            "Otomatik": "otomatik", "Tüm Ölçümler": "ham", "Günlük": "gun",
+            "Haftalık": "hafta", "Aylık": "ay", "Seyreltilmiş": "lttb",
+        }
         
         # --- TUZ DÖNÜŞÜM TABLOSU (Sınıf Özelliği Olarak Tanımlandı) ---
         self.tuz_donusum_tablosu = {
@@ -81,13 +118,9 @@ class HipertansiyonApp:
         }
         # -------------------------------------------------------------
         
-        # Veri İşleyiciyi Başlat
-        self.veri_isleyici = VeriIsleyici()
-        
-        if self.veri_isleyici.df is None:
-            messagebox.showerror("Kritik Hata", "Veri seti (hypertension_data.csv) bulunamadı!\nLütfen data klasörünü kontrol edin.")
-            self.root.destroy()
-            return
+        # Veri İşleyici arka planda hazırlanır (giriş ekranında başlatılmış olabilir)
+        self.veri_isleyici = None
+        self.egitim_gorevi = egitim_gorevi or egitimi_baslat()
 
         self.tab_control = ttk.Notebook(root)
         self.tab1 = ttk.Frame(self.tab_control)
@@ -98,17 +131,75 @@ class HipertansiyonApp:
         self.tab_control.pack(expand=1, fill="both")
         
         self.son_analiz_sonuclari = {} 
+
+        # Analizler arka planda tek işçide sırayla hesaplanır
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self._analiz_gorevi = None
+        self._analiz_no = 0
         
         self.create_analysis_tab()
         self.create_history_tab()
 
         self.tab_control.bind("<<NotebookTabChanged>>", self.on_tab_change)
+        if izleme.etkin():
+            # F12: bir sonraki analizin hesaplama ve çizim adımlarını cProfile ile kaydet
+            self.root.bind("<F12>", self.sonraki_analizi_profille)
+        self._egitim_bekle()
+
+    def sonraki_analizi_profille(self, event=None):
+        zaman = datetime.now().strftime('%Y%m%d_%H%M%S')
+        for ad in ('analiz_hesapla', 'analiz_goster'):
+            izleme.profil_iste(ad, f"profil_{ad}_{zaman}.prof")
+        print("ℹ️ Bir sonraki analiz profillenecek.")
+
+    def _egitim_bekle(self):
+        """Model hazır olana kadar analiz butonunu kapalı tutar; geçmiş sekmesi bu sürede kullanılabilir."""
+        if not self.egitim_gorevi.done():
+            self.root.after(50, self._egitim_bekle)
+            return
+
+        try:
+            self.veri_isleyici = self.egitim_gorevi.result()
+        except Exception as e:
+            print(f"Hata: {e}")
+
+        if self.veri_isleyici is None or self.veri_isleyici.df is None:
+            messagebox.showerror("Kritik Hata", "Veri seti (hypertension_data.csv) bulunamadı!\nLütfen data klasörünü kontrol edin.")
+            self.root.destroy()
+            return
+
+        self.btn_analiz.config(state="normal", text="ANALİZİ BAŞLAT")
 
     def create_history_tab(self):
+        # Uzun geçmişlerde tarih penceresi ve ayrıntı seviyesi seçimi
+        ust_cerceve = tk.Frame(self.tab2)
+        ust_cerceve.pack(fill=tk.X, padx=10, pady=(10, 0))
+
+        tk.Label(ust_cerceve, text="Dönem").pack(side=tk.LEFT)
+        self.cb_gecmis_pencere = ttk.Combobox(ust_cerceve, values=list(self.gecmis_pencereleri.keys()), state="readonly", width=12)
+        self.cb_gecmis_pencere.set("Tümü")
+        self.cb_gecmis_pencere.pack(side=tk.LEFT, padx=(5, 15))
+
+        tk.Label(ust_cerceve, text="Ayrıntı").pack(side=tk.LEFT)
+        self.cb_gecmis_seviye = ttk.Combobox(ust_cerceve, values=list(self.gecmis_seviyeleri.keys()), state="readonly", width=12)
+        self.cb_gecmis_seviye.set("Otomatik")
+        self.cb_gecmis_seviye.pack(side=tk.LEFT, padx=5)
+
+        for cb in (self.cb_gecmis_pencere, self.cb_gecmis_seviye):
+            cb.bind("<<ComboboxSelected>>", self.gecmis_gorunumu_degisti)
+
         self.graph_frame_gecmis = tk.Frame(self.tab2, bg="white")
         self.graph_frame_gecmis.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        from modules.grafikler import GrafikCizici
         self.grafik_yonetici_gecmis = GrafikCizici(self.graph_frame_gecmis)
 
+    def gecmis_gorunumu_degisti(self, event=None):
+        gun = self.gecmis_pencereleri[self.cb_gecmis_pencere.get()]
+        pencere = (datetime.now() - timedelta(days=gun), None) if gun else None
+        self.grafik_yonetici_gecmis.trend_gorunumu(
+            pencere=pencere, seviye=self.gecmis_seviyeleri[self.cb_gecmis_seviye.get()]
+        )
+
     def create_analysis_tab(self):
         left_container = tk.Frame(self.tab1, width=330, bg="#f0f0f0") 
         left_container.pack(side=tk.LEFT, fill=tk.Y)
@@ -221,16 +312,19 @@ class HipertansiyonApp:
         self.cb_diabetes.pack(pady=2, fill=tk.X)
         # -----------------------------
 
-        tk.Button(self.scrollable_frame, text="ANALİZİ BAŞLAT", bg="#2980b9", fg="white", font=("Arial", 11, "bold"), command=self.analiz_yap).pack(pady=20, fill=tk.X)
+        self.btn_analiz = tk.Button(self.scrollable_frame, text="⏳ Model hazırlanıyor...", bg="#2980b9", fg="white", font=("Arial", 11, "bold"), state="disabled", command=self.analiz_yap)
+        self.btn_analiz.pack(pady=20, fill=tk.X)
         self.btn_oneri = tk.Button(self.scrollable_frame, text="💡 İyileştirme Önerileri", bg="#f39c12", fg="white", font=("Arial", 10, "bold"), state="disabled", command=self.oneri_goster)
         self.btn_oneri.pack(pady=5, fill=tk.X)
         self.btn_pdf = tk.Button(self.scrollable_frame, text="Detaylı Rapor (PDF)", bg="#c0392b", fg="white", state="disabled", command=self.pdf_rapor_olustur)
         self.btn_pdf.pack(pady=5, fill=tk.X)
+        self.pb_analiz = ttk.Progressbar(self.scrollable_frame, mode="indeterminate")
         self.lbl_sonuc = tk.Label(self.scrollable_frame, text="", bg="#f0f0f0", fg="black", justify="left", font=("Arial", 10))
         self.lbl_sonuc.pack(pady=10)
 
         self.graph_frame = tk.Frame(self.tab1, bg="white")
         self.graph_frame.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True)
+        from modules.grafikler import GrafikCizici
         self.grafik_yonetici = GrafikCizici(self.graph_frame)
 
     def tuz_hesapla_guncelle(self, event=None):
@@ -250,7 +344,9 @@ class HipertansiyonApp:
         except ValueError:
             self.lbl_tuz_gram.config(text="Lütfen sayı giriniz", fg="red")
 
+    @izle('analiz_yap')
     def analiz_yap(self):
+        from modules.veri_isleme import SIGARA_KODLARI, aktivite_seviyesi
         try:
             # 1. VERİLERİ TOPLA
             vals = {}
@@ -278,20 +374,22 @@ class HipertansiyonApp:
             bmi = vals['weight'] / ((vals['height']/100) ** 2)
             vals['BMI'] = bmi
             
+            # Seçimler tıklama anında alınır; analiz sürerken değiştirilse de kayıt ve öneriler bunlarla yapılır
+            secimler = {
+                'Sigara': self.cb_smoking.get(),
+                'Cinsiyet': self.cb_gender.get(),
+                'Aile_Oykusu': self.cb_genetic.get(),
+            }
+
             # Kategorik Dönüşümler
-            gender_val = 1 if self.cb_gender.get() == "Erkek" else 0
+            gender_val = 1 if secimler['Cinsiyet'] == "Erkek" else 0
             
-            smk_map = {"İçmiyor": 0, "Bırakmış": 1, "İçiyor": 2}
-            smoking_val = smk_map[self.cb_smoking.get()]
+            smoking_val = SIGARA_KODLARI[secimler['Sigara']]
             
-            genetic_val = 1 if self.cb_genetic.get() == "Evet" else 0
+            genetic_val = 1 if secimler['Aile_Oykusu'] == "Evet" else 0
             
             # Aktivite Seviyesini Dakikadan 1-4 arasına çevir (Dataset uyumu için)
-            act_min = vals['activity_min']
-            if act_min < 30: act_lvl = 1
-            elif act_min < 60: act_lvl = 2
-            elif act_min < 90: act_lvl = 3
-            else: act_lvl = 4
+            act_lvl = int(aktivite_seviyesi(vals['activity_min']))
 
             # Hastalık Durumları
             has_htn = 1 if self.cb_hypertension.get() == "Evet" else 0
@@ -319,108 +417,130 @@ class HipertansiyonApp:
                 'Family_History_Num': genetic_val
             }
 
-            sonuc_metni = ""
-            risk_htn, risk_dm = 0, 0
-
-            # ================= 4 SENARYO ANALİZİ =================
-
-            df_benzer = self.veri_isleyici.get_benzer_kisiler(
-                age=vals['age'], 
-                gender=gender_val, 
-                limit=500
-            )
-
-            # SENARYO 1: Hipertansiyon VAR, Diyabet YOK
-            # Hedef: Diyabet riskini hesapla + Etki faktörleri
-            if has_htn and not has_dm:
-                risk_dm = self.veri_isleyici.tahmin_et_dm(user_data_for_model, htn_status=1)
-                etkiler = self.veri_isleyici.get_etki_analizi(user_data_for_model, target='dm', existing_condition=1)
-                
-                sonuc_metni = f"Mevcut Durum: Hipertansiyon Hastası\n🛡️ DİYABET RİSKİ: %{risk_dm:.1f}"
-                
-                self.grafik_yonetici.ciz_tekil_risk_analizi(
-                    df_similar=df_benzer, 
-                    user_x=vals['age'], 
-                    user_y=vals['glucose'], 
-                    risk_score=risk_dm, 
-                    etki_dict=etkiler, 
-                    mod="dm"
-                )
-
-            # SENARYO 2: Hipertansiyon YOK, Diyabet VAR
-            # Hedef: Hipertansiyon riskini hesapla + Etki faktörleri
-            elif not has_htn and has_dm:
-                risk_htn = self.veri_isleyici.tahmin_et_htn(user_data_for_model, diabetes_status=1)
-                etkiler = self.veri_isleyici.get_etki_analizi(user_data_for_model, target='htn', existing_condition=1)
-                
-                sonuc_metni = f"Mevcut Durum: Diyabet Hastası\n🛡️ TANSİYON RİSKİ: %{risk_htn:.1f}"
-                
-                self.grafik_yonetici.ciz_tekil_risk_analizi(
-                    df_similar=df_benzer, 
-                    user_x=vals['age'], 
-                    user_y=vals['sysBP'], 
-                    risk_score=risk_htn, 
-                    etki_dict=etkiler, 
-                    mod="htn"
-                )
-
-            # SENARYO 3: İkisi de YOK (Sağlıklı Görünüyor)
-            # Hedef: İkisinin de riskini hesapla + İkisinin de faktörlerini göster
-            elif not has_htn and not has_dm:
-                risk_htn = self.veri_isleyici.tahmin_et_htn(user_data_for_model, diabetes_status=0)
-                risk_dm = self.veri_isleyici.tahmin_et_dm(user_data_for_model, htn_status=0)
-                
-                etkiler_htn = self.veri_isleyici.get_etki_analizi(user_data_for_model, target='htn', existing_condition=0)
-                etkiler_dm = self.veri_isleyici.get_etki_analizi(user_data_for_model, target='dm', existing_condition=0)
-
-                sonuc_metni = f"❤️ TANSİYON RİSKİ: %{risk_htn:.1f}\n🩸 DİYABET RİSKİ: %{risk_dm:.1f}"
-                
-                self.grafik_yonetici.ciz_ikili_risk_dashboard(
-                    df_similar=df_benzer,
-                    user_age=vals['age'],
-                    user_bp=vals['sysBP'],
-                    user_glc=vals['glucose'],
-                    risk_htn=risk_htn,
-                    risk_dm=risk_dm,
-                    etki_htn=etkiler_htn,
-                    etki_dm=etkiler_dm
-                )
-            # SENARYO 4: İkisi de VAR
-            # Hedef: Risk hesabı anlamsız. "Sağlık Yönetimi Dashboard" göster.
-            else:
-                sonuc_metni = "⚠️ İki kronik rahatsızlık mevcut.\nRisk yerine değerlerinizin ideal aralıklara\nolan uzaklığı analiz edildi."
-                self.grafik_yonetici.ciz_saglik_yonetimi(user_data_for_model)
-
-            self.lbl_sonuc.config(text=sonuc_metni, fg="blue")
-            
-            # PDF ve CSV Kayıt için verileri sakla
-            self.son_analiz_sonuclari = {
-                'vals': vals, 
-                'bmi': bmi, 
-                'risk_htn': risk_htn, 
-                'risk_dm': risk_dm, 
-                'has_htn': has_htn, 
-                'has_dm': has_dm,
-                'msg': sonuc_metni
-            }
-            
-            # --- BUTONLARI AKTİF ET ---
-            self.btn_pdf.config(state="normal")   # PDF Butonunu aç
-            try:
-                self.btn_oneri.config(state="normal") # Öneri Butonunu aç 
-            except AttributeError:
-                pass # Eğer butonu henüz eklemediysen hata vermesin diye
-            # --------------------------
-            
-            if max(risk_htn, risk_dm) > 0:
-                self.kaydet(vals, max(risk_htn, risk_dm))
-
         except ValueError as ve:
              messagebox.showerror("Hata", f"Değer hatası: {ve}")
+             return
+        except Exception as e:
+            import traceback
+            traceback.print_exc()
+            messagebox.showerror("Hata", f"Beklenmedik hata: {e}")
+            return
+
+        # Yeni tıklama eskisini geçersiz kılar; sonuçlar geldiğinde sadece en son istek çizilir
+        self._analiz_no += 1
+        if self._analiz_gorevi is not None:
+            self._analiz_gorevi.cancel()
+        self._analiz_baslangic = time.perf_counter()
+        self._analiz_gorevi = self.executor.submit(
+            self._analiz_hesapla, user_data_for_model, vals, secimler, gender_val, has_htn, has_dm
+        )
+        self.lbl_sonuc.config(text="⏳ Analiz ediliyor...", fg="gray")
+        self.pb_analiz.pack(pady=(0, 5), fill=tk.X)
+        self.pb_analiz.start(10)
+        self.root.after(20, self._analiz_bekle, self._analiz_gorevi, self._analiz_no)
+
+    @izle('analiz_hesapla')
+    def _analiz_hesapla(self, user_data_for_model, vals, secimler, gender_val, has_htn, has_dm):
+        """Arka planda çalışır: Tk nesnelerine dokunmaz, sadece sonuç sözlüğü üretir."""
+        vi = self.veri_isleyici
+        sonuc = {'vals': vals, 'user_data': user_data_for_model, 'secimler': secimler,
+                 'has_htn': has_htn, 'has_dm': has_dm, 'risk_htn': 0, 'risk_dm': 0}
+
+        # ================= 4 SENARYO ANALİZİ =================
+
+        sonuc['df_benzer'] = vi.get_benzer_kisiler(
+            age=vals['age'], 
+            gender=gender_val, 
+            limit=500
+        )
+
+        # SENARYO 1: Hipertansiyon VAR, Diyabet YOK
+        # Hedef: Diyabet riskini hesapla + Etki faktörleri
+        if has_htn and not has_dm:
+            aciklama = vi.acikla(user_data_for_model, diabetes_status=0, htn_status=1)['dm']
+            sonuc['risk_dm'] = aciklama['risk']
+            sonuc['etkiler'] = aciklama['etkiler']
+            sonuc['msg'] = f"Mevcut Durum: Hipertansiyon Hastası\n🛡️ DİYABET RİSKİ: %{sonuc['risk_dm']:.1f}"
+
+        # SENARYO 2: Hipertansiyon YOK, Diyabet VAR
+        # Hedef: Hipertansiyon riskini hesapla + Etki faktörleri
+        elif not has_htn and has_dm:
+            aciklama = vi.acikla(user_data_for_model, diabetes_status=1, htn_status=0)['htn']
+            sonuc['risk_htn'] = aciklama['risk']
+            sonuc['etkiler'] = aciklama['etkiler']
+            sonuc['msg'] = f"Mevcut Durum: Diyabet Hastası\n🛡️ TANSİYON RİSKİ: %{sonuc['risk_htn']:.1f}"
+
+        # SENARYO 3: İkisi de YOK (Sağlıklı Görünüyor)
+        # Hedef: İkisinin de riskini hesapla + İkisinin de faktörlerini göster
+        elif not has_htn and not has_dm:
+            aciklama = vi.acikla(user_data_for_model, diabetes_status=0, htn_status=0)
+            sonuc['risk_htn'] = aciklama['htn']['risk']
+            sonuc['risk_dm'] = aciklama['dm']['risk']
+            sonuc['etkiler_htn'] = aciklama['htn']['etkiler']
+            sonuc['etkiler_dm'] = aciklama['dm']['etkiler']
+            sonuc['msg'] = f"❤️ TANSİYON RİSKİ: %{sonuc['risk_htn']:.1f}\n🩸 DİYABET RİSKİ: %{sonuc['risk_dm']:.1f}"
+
+        # SENARYO 4: İkisi de VAR
+        # Hedef: Risk hesabı anlamsız. "Sağlık Yönetimi Dashboard" göster.
+        else:
+            sonuc['msg'] = "⚠️ İki kronik rahatsızlık mevcut.\nRisk yerine değerlerinizin ideal aralıklara\nolan uzaklığı analiz edildi."
+
+        return sonuc
+
+    def _analiz_bekle(self, gorev, no):
+        """Ana döngüden arka plan görevini yoklar; eski isteklerin sonuçlarını atar."""
+        if no != self._analiz_no:
+            return
+        if not gorev.done():
+            self.root.after(20, self._analiz_bekle, gorev, no)
+            return
+
+        self.pb_analiz.stop()
+        self.pb_analiz.pack_forget()
+        try:
+            self._analiz_goster(gorev.result())
+            # Tıklamadan grafiğin ekrana gelmesine kadar geçen toplam süre
+            izleme.sure_ekle('analiz_toplam', time.perf_counter() - self._analiz_baslangic)
         except Exception as e:
             import traceback
             traceback.print_exc()
+            self.lbl_sonuc.config(text="", fg="black")
             messagebox.showerror("Hata", f"Beklenmedik hata: {e}")
+
+    @izle('analiz_goster')
+    def _analiz_goster(self, sonuc):
+        vals = sonuc['vals']
+        has_htn, has_dm = sonuc['has_htn'], sonuc['has_dm']
+        risk_htn, risk_dm = sonuc['risk_htn'], sonuc['risk_dm']
+
+        self.grafik_yonetici.ciz_analiz_sonucu(sonuc)
+
+        sonuc_metni = sonuc['msg']
+        self.lbl_sonuc.config(text=sonuc_metni, fg="blue")
+        
+        # PDF ve CSV Kayıt için verileri sakla
+        self.son_analiz_sonuclari = {
+            'vals': vals, 
+            'bmi': vals['BMI'], 
+            'risk_htn': risk_htn, 
+            'risk_dm': risk_dm, 
+            'has_htn': has_htn, 
+            'has_dm': has_dm,
+            'smoking': sonuc['user_data']['Smoking_Num'],
+            'secimler': sonuc['secimler'],
+            'msg': sonuc_metni
+        }
+        
+        # --- BUTONLARI AKTİF ET ---
+        self.btn_pdf.config(state="normal")   # PDF Butonunu aç
+        try:
+            self.btn_oneri.config(state="normal") # Öneri Butonunu aç 
+        except AttributeError:
+            pass # Eğer butonu henüz eklemediysen hata vermesin diye
+        # --------------------------
+        
+        if max(risk_htn, risk_dm) > 0:
+            self.kaydet(vals, sonuc['secimler'], max(risk_htn, risk_dm))
     
     def oneri_goster(self):
         if not self.son_analiz_sonuclari:
@@ -478,7 +598,7 @@ class HipertansiyonApp:
             oneriler.append("🍷 Alkol Tüketimi: Alkol kan basıncını ve trigliseridi yükseltir. Mümkünse bırakılmalı veya sınırlandırılmalıdır.")
 
         # 9. Sigara (Dataset: Smoking_Status)
-        if self.cb_smoking.get() == "İçiyor":
+        if data['secimler']['Sigara'] == "İçiyor":
             oneriler.append("🚬 Sigara: Sigara damar yapısını bozar ve pıhtı riskini artırır. Bırakmak için profesyonel destek alabilirsiniz.")
 
         # HİÇBİR SORUN YOKSA
@@ -527,235 +647,76 @@ class HipertansiyonApp:
 
         tk.Button(top, text="Kapat", bg="#e74c3c", fg="white", font=("Arial", 10, "bold"), command=top.destroy).pack(pady=10)
     
-    def metin_temizle(self, text):
-        """Türkçe karakterleri İngilizceye çevirir ve emojileri temizler."""
-        if not isinstance(text, str):
-            return str(text)
-            
-        # 1. Türkçe Karakter Dönüşümü
-        tr_map = {
-            'ı': 'i', 'İ': 'I', 'ş': 's', 'Ş': 'S', 'ğ': 'g', 'Ğ': 'G',
-            'ü': 'u', 'Ü': 'U', 'ö': 'o', 'Ö': 'O', 'ç': 'c', 'Ç': 'C'
-        }
-        for tr, en in tr_map.items():
-            text = text.replace(tr, en)
-            
-        # 2. Emojileri Temizle (Standart PDF fontları emojileri basamaz)
-        emojis = ['🛡️', '🩸', '❤️', '⚠️', '🔴', '🟠', '✅', '🍔', '🏃', 'g😴', '😴', '💤', '🍷', '🚬', '💡', '■']
-        for emoji in emojis:
-            text = text.replace(emoji, "")
-            
-        return text.strip() 
-
+    @izle('pdf_rapor_olustur')
     def pdf_rapor_olustur(self):
         if not self.son_analiz_sonuclari: return
-        data = self.son_analiz_sonuclari
-        vals = data['vals']
-        
-        # Dosya ismindeki Türkçe karakterleri de temizle
-        clean_name = self.metin_temizle(self.kullanici_adi).replace(" ", "_")
-        pdf_path = PDF_DIR / f"Rapor_{clean_name}.pdf"
+        from modules.pdf_rapor import rapor_yaz, rapor_dosya_adi
+        pdf_path = PDF_DIR / rapor_dosya_adi(self.kullanici_adi)
 
-        
         try:
-            c = canvas.Canvas(str(pdf_path), pagesize=A4)
-            width, height = A4
-            
-            # --- BAŞLIK ---
-            c.setFont("Helvetica-Bold", 18)
-            c.drawCentredString(width/2, 800, "SAGLIK RISK ANALIZI VE ONERI RAPORU")
-            
-            c.setFont("Helvetica", 10)
-            c.drawCentredString(width/2, 780, f"Rapor Tarihi: {datetime.now().strftime('%d/%m/%Y %H:%M')}")
-            # İsim kısmını temizle
-            c.drawCentredString(width/2, 765, f"Danisan: {self.metin_temizle(self.kullanici_adi).replace('_', ' ')}")
-            
-            c.line(50, 750, 550, 750) # Çizgi
-
-            # --- 1. GİRİLEN KLİNİK DEĞERLER ---
-            y = 720
-            c.setFont("Helvetica-Bold", 12)
-            c.drawString(50, y, "1. KLINIK DEGERLERINIZ")
-            y -= 25
-            
-            c.setFont("Helvetica", 10)
-            # Değerleri yazdırırken metin temizlemeye gerek yok çünkü zaten sayısal veya ingilizce formatta
-            # Ancak label kısımlarını garanti olsun diye ingilizce karakter kullanıyoruz
-            c.drawString(50, y, f"Yas: {int(vals['age'])}")
-            c.drawString(50, y-15, f"BMI (Kilo Indeksi): {data['bmi']:.1f}")
-            c.drawString(50, y-30, f"Tansiyon: {int(vals['sysBP'])}/{int(vals['diaBP'])} mmHg")
-            c.drawString(50, y-45, f"Nabiz: {int(vals['heartRate'])} bpm")
-            
-            c.drawString(220, y, f"Aclik Sekeri: {int(vals['glucose'])} mg/dL")
-            c.drawString(220, y-15, f"T. Kolesterol: {int(vals['totChol'])} mg/dL")
-            c.drawString(220, y-30, f"LDL / HDL: {int(vals['LDL'])} / {int(vals['HDL'])}(mg/dL)")
-            c.drawString(220, y-45, f"Trigliserit: {int(vals['triglycerides'])} mg/dL")
-            
-            c.drawString(400, y, f"Tuz Tuketimi: {vals['salt']:.1f} g/gun")
-            c.drawString(400, y-15, f"Uyku Suresi: {vals['sleep']} saat")
-            c.drawString(400, y-30, f"Aktivite: {int(vals['activity_min'])} dk/gun")
-            
-            y -= 70
-            c.line(50, y, 550, y)
-
-            # --- 2. ANALİZ SONUCU VE RİSK DURUMU ---
-            y -= 30
-            c.setFont("Helvetica-Bold", 12)
-            c.drawString(50, y, "2. ANALIZ SONUCU")
-            y -= 25
-            
-            # BURADA TEMİZLEME YAPIYORUZ
-            # data['msg'] içindeki emojileri silip Türkçe karakterleri düzeltecek
-            clean_msg = self.metin_temizle(data['msg'])
-            
-            c.setFont("Helvetica", 11)
-            lines = clean_msg.split('\n')
-            for line in lines:
-                # Renklendirme mantığı (RISK kelimesini temizledikten sonra kontrol et)
-                if "RISK" in line or "RISKI" in line: c.setFillColorRGB(0.8, 0, 0) 
-                else: c.setFillColorRGB(0, 0, 0)
-                
-                c.drawString(50, y, line)
-                y -= 15
-            
-            y -= 20
-            c.setFillColorRGB(0, 0, 0)
-            c.line(50, y, 550, y)
-
-            # --- 3. KAPSAMLI ÖZET ---
-            y -= 30
-            c.setFont("Helvetica-Bold", 12)
-            c.drawString(50, y, "3. KAPSAMLI RISK DEGERLENDIRMESI")
-            y -= 20
-            
-            c.setFont("Helvetica", 10)
-            ozet_metni = []
-            
-            if vals['sysBP'] > 130 or vals['diaBP'] > 85:
-                ozet_metni.append("- Tansiyon degerleriniz ideal sinirin uzerinde.")
-            if vals['glucose'] > 100:
-                ozet_metni.append("- Kan sekeri seviyeniz prediyabet veya diyabet sinirlarinda.")
-            if data['bmi'] > 25:
-                ozet_metni.append("- Kilo indeksiniz normalin uzerinde.")
-            if vals['LDL'] > 130 or vals['triglycerides'] > 150:
-                ozet_metni.append("- Kan yaglariniz (Kolesterol/Trigliserit) yuksek.")
-            
-            if not ozet_metni:
-                ozet_metni.append("- Genel klinik tablonuz saglikli gorunuyor.")
-            else:
-                ozet_metni.append("- Yukaridaki risk faktorleri metabolik sendrom riski olusturabilir.")
-
-            for madde in ozet_metni:
-                # Burada da temizleme fonksiyonunu çağırıyoruz
-                c.drawString(50, y, self.metin_temizle(madde))
-                y -= 15
-
-            y -= 20
-            c.line(50, y, 550, y)
-
-            # --- 4. YASAM TARZI NOTLARI ---
-            y -= 30
-            c.setFont("Helvetica-Bold", 12)
-            c.drawString(50, y, "4. YASAM TARZI VE ONERILER")
-            y -= 20
-            
-            c.setFont("Helvetica", 10)
-            oneri_metni = []
-            
-            if vals['salt'] > 5:
-                oneri_metni.append("* Tuz kullanimini azaltin (Gunde 1 tatli kasigini gecmemeli).")
-            if vals['sleep'] < 7:
-                oneri_metni.append("* Uyku duzeninizi iyilestirin.")
-            if vals['activity_min'] < 30:
-                oneri_metni.append("* Fiziksel aktiviteniz yetersiz. Haftada en az 150 dk yuruyus yapin.")
-            if data.get('smoking', 0) == 2: # Eğer smoking verisini kaydettiysen
-                oneri_metni.append("* Sigara kullanimini birakmak icin destek alin.")
-            if vals['sysBP'] > 120:
-                oneri_metni.append("* DASH diyeti tansiyonu dengelemeye yardimci olur.")
-
-            if not oneri_metni:
-                oneri_metni.append("* Yasam tarzi aliskanliklariniz gayet iyi.")
-
-            for oneri in oneri_metni:
-                c.drawString(50, y, self.metin_temizle(oneri))
-                y -= 15
-
-            # --- DİPNOT ---
-            c.setFont("Helvetica-Oblique", 8)
-            c.drawCentredString(width/2, 50, "Bu rapor yapay zeka destekli bir analizdir. Kesin tani icin doktorunuza basvurunuz.")
-
-            c.save()
+            # Ekrandaki grafik, dosyaya yazılmadan bellekten rapora eklenir
+            rapor_yaz(self.son_analiz_sonuclari, pdf_path, self.kullanici_adi,
+                      grafik=self.grafik_yonetici.bayt('png'))
             if platform.system() == 'Windows':
                 os.startfile(str(pdf_path))
             else:
                 subprocess.call(['open', str(pdf_path)])
             
         except Exception as e: messagebox.showerror("Hata", str(e))
-    def kaydet(self, vals, risk):
-        exists = os.path.exists(self.dosya_adi)
+    @izle('kaydet')
+    def kaydet(self, vals, secimler, risk):
         try:
-            with open(self.dosya_adi, "a", newline="", encoding="utf-8") as f:
-                writer = csv.writer(f)
-                
-                # DOKTOR İÇİN GENİŞLETİLMİŞ BAŞLIKLAR
-                # Not: Grafiğin bozulmaması için 'SysBP' ve 'DiaBP' isimlerini koruduk.
-                basliklar = [
-                    "Tarih", 
-                    "SysBP", "DiaBP", "Risk_Skoru",  # Temel Grafikler İçin
-                    "Nabiz", "Seker", "BMI", "Kilo", # Klinik Önemli
-                    "Kolesterol", "LDL", "HDL", "Trigliserit", # Kan Yağları
-                    "Tuz_Gr", "Sigara", "Alkol", "Uyku", "Aktivite", # Yaşam Tarzı
-                    "Yas", "Cinsiyet", "Aile_Oykusu" # Demografik
-                ]
-                
-                if not exists: 
-                    writer.writerow(basliklar)
-                
-                # VERİ SATIRINI HAZIRLA
-                tarih_saat = datetime.now().strftime("%d.%m.%Y %H:%M")
-                
-                veri_satiri = [
-                    tarih_saat,
-                    int(vals['sysBP']),
-                    int(vals['diaBP']),
-                    f"{risk:.1f}",
-                    int(vals['heartRate']),
-                    int(vals['glucose']),
-                    f"{vals['BMI']:.1f}",
-                    vals['weight'],
-                    vals['totChol'],
-                    vals['LDL'],
-                    vals['HDL'],
-                    vals['triglycerides'],
-                    f"{vals['salt']:.1f}",       # Tuz (Gram cinsinden)
-                    self.cb_smoking.get(),       # Sigara Durumu (Yazı olarak)
-                    vals['alcohol'],             # Alkol (Bardak)
-                    vals['sleep'],               # Uyku (Saat)
-                    vals['activity_min'],        # Aktivite (Dakika)
-                    int(vals['age']),
-                    self.cb_gender.get(),        # Cinsiyet (Yazı olarak)
-                    self.cb_genetic.get()        # Aile Öyküsü (Yazı olarak)
-                ]
-                
-                writer.writerow(veri_satiri)
-                
+            # DOKTOR İÇİN GENİŞLETİLMİŞ KAYIT (sütunlar: KAYIT_SUTUNLARI)
+            kayit = {
+                "Tarih": datetime.now().replace(second=0, microsecond=0),
+                "SysBP": int(vals['sysBP']),
+                "DiaBP": int(vals['diaBP']),
+                "Risk_Skoru": round(risk, 1),
+                "Nabiz": int(vals['heartRate']),
+                "Seker": int(vals['glucose']),
+                "BMI": round(vals['BMI'], 1),
+                "Kilo": vals['weight'],
+                "Kolesterol": vals['totChol'],
+                "LDL": vals['LDL'],
+                "HDL": vals['HDL'],
+                "Trigliserit": vals['triglycerides'],
+                "Tuz_Gr": round(vals['salt'], 1),      # Tuz (Gram cinsinden)
+                "Sigara": secimler['Sigara'],           # Sigara Durumu (Yazı olarak)
+                "Alkol": vals['alcohol'],               # Alkol (Bardak)
+                "Uyku": vals['sleep'],                  # Uyku (Saat)
+                "Aktivite": vals['activity_min'],       # Aktivite (Dakika)
+                "Yas": int(vals['age']),
+                "Cinsiyet": secimler['Cinsiyet'],       # Cinsiyet (Yazı olarak)
+                "Aile_Oykusu": secimler['Aile_Oykusu']  # Aile Öyküsü (Yazı olarak)
+            }
+            self.gecmis.ekle(self.kullanici_adi, kayit)
+
         except Exception as e:
             print(f"Kayıt hatası: {e}")
             messagebox.showerror("Kayıt Hatası", str(e))
 
     def on_tab_change(self, event):
-        if self.tab_control.index("current") == 1 and os.path.exists(self.dosya_adi):
+        if self.tab_control.index("current") == 1:
             try:
-                df = pd.read_csv(self.dosya_adi)
-                self.grafik_yonetici_gecmis.ciz_gecmis_trend(df)
-            except: pass
+                # İlk açılışta tüm geçmiş, sonrasında sadece son çizimden bu yana eklenen kayıtlar okunur.
+                # Önceki çizim başarısız olduysa bellekte seri yoktur: tüm geçmiş yeniden okunur
+                grafik = self.grafik_yonetici_gecmis
+                ekle = self._gecmis_son_kimlik is not None and grafik.trend_hazir
+                df = self.gecmis.getir(self.kullanici_adi, kimlik_sonra=self._gecmis_son_kimlik if ekle else None)
+                # Kimlik sadece çizim başarılıysa ilerler; aksi halde kayıtlar sonraki açılışta tekrar denenir
+                if grafik.ciz_gecmis_trend(df, ekle=ekle) and not df.empty:
+                    self._gecmis_son_kimlik = int(df.index.max())
+            except Exception as e:
+                print(f"Geçmiş okuma hatası: {e}")
 
 if __name__ == "__main__":
     root_login = tk.Tk()
     login = LoginPenceresi(root_login)
+    # Kullanıcı adını yazarken modeller arka planda hazırlanır
+    egitim_gorevi = egitimi_baslat()
     root_login.mainloop()
     
     if login.kullanici_adi:
         root_main = tk.Tk()
-        app = HipertansiyonApp(root_main, login.kullanici_adi)
+        app = HipertansiyonApp(root_main, login.kullanici_adi, egitim_gorevi)
         root_main.mainloop()
\ No newline at end of file
@@ -0,0 +1,92 @@
+"""Açılış süresi denetimi.
+
+``python -X importtime -c "import main"`` çıktısını okur; toplam içe aktarma
+süresini ve en pahalı modülleri raporlar. Süre bütçeyi aşarsa ya da giriş
+ekranı açılmadan ağır bir kütüphane (pandas, sklearn, matplotlib, reportlab...)
+yüklenirse 1 ile çıkar; CI'da ya da yayın öncesi elle çalıştırılabilir.
+
+    python -m modules.baslangic_olcumu --butce-ms 150
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+# Giriş ekranı açılırken yüklenmemesi gereken üst düzey paketler
+AGIR_PAKETLER = ('numpy', 'pandas', 'scipy', 'sklearn', 'matplotlib', 'reportlab', 'PIL')
+VARSAYILAN_BUTCE_MS = 150
+
+
+def importtime_oku(cikti):
+    """``-X importtime`` satırlarını {modül: (kendi_us, toplam_us)} sözlüğüne çevirir."""
+    moduller = {}
+    for satir in cikti.splitlines():
+        if not satir.startswith('import time:'):
+            continue
+        parcalar = satir[len('import time:'):].split('|')
+        if len(parcalar) != 3 or not parcalar[0].strip().isdigit():
+            continue  # Başlık satırı
+        moduller[parcalar[2].strip()] = (int(parcalar[0]), int(parcalar[1]))
+    return moduller
+
+
+def olc(modul='main'):
+    """``modul``ü temiz bir yorumlayıcıda içe aktarır, importtime sonuçlarını döner."""
+    ortam = dict(os.environ, PYTHONDONTWRITEBYTECODE='1')
+    ortam.pop('SAGLIK_IZLEME', None)
+    sonuc = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {modul}'],
+                           cwd=BASE_DIR, env=ortam, capture_output=True, text=True)
+    if sonuc.returncode != 0:
+        raise RuntimeError(sonuc.stderr.strip().splitlines()[-1] if sonuc.stderr.strip() else "içe aktarma başarısız")
+    return importtime_oku(sonuc.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Uygulamanın açılışta içe aktarma süresini bütçeyle karşılaştırır.")
+    parser.add_argument('--modul', default='main', help="Ölçülecek modül (varsayılan: main)")
+    parser.add_argument('--butce-ms', type=float, default=VARSAYILAN_BUTCE_MS, help="İzin verilen toplam süre (ms)")
+    parser.add_argument('--tekrar', type=int, default=3, help="Ölçüm tekrarı; en hızlısı kullanılır")
+    parser.add_argument('--ilk', type=int, default=10, help="Listelenecek en pahalı modül sayısı")
+    parser.add_argument('--json', help="Sonuçların yazılacağı JSON dosyası")
+    args = parser.parse_args(argv)
+
+    try:
+        # Disk önbelleği ve zamanlama gürültüsü için en hızlı çalışma esas alınır
+        olcumler = [olc(args.modul) for _ in range(max(1, args.tekrar))]
+    except Exception as e:
+        print(f"Hata: {e}", file=sys.stderr)
+        return 1
+    moduller = min(olcumler, key=lambda m: m.get(args.modul, (0, 0))[1])
+    toplam_ms = moduller.get(args.modul, (0, 0))[1] / 1000
+
+    print(f"{args.modul} içe aktarma süresi: {toplam_ms:.1f} ms (bütçe {args.butce_ms:.0f} ms)")
+    print(f"{'modül':<48}{'kendi ms':>10}{'toplam ms':>11}")
+    for ad, (kendi, toplam) in sorted(moduller.items(), key=lambda m: -m[1][0])[:args.ilk]:
+        print(f"{ad:<48}{kendi / 1000:>10.1f}{toplam / 1000:>11.1f}")
+
+    agir = sorted(p for p in AGIR_PAKETLER if p in moduller)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'modul': args.modul, 'toplam_ms': toplam_ms, 'butce_ms': args.butce_ms,
+                       'agir_paketler': agir,
+                       'moduller': {ad: {'kendi_ms': k / 1000, 'toplam_ms': t / 1000} for ad, (k, t) in moduller.items()}},
+                      f, ensure_ascii=False, indent=2)
+
+    hata = False
+    if agir:
+        print(f"🔴 Açılışta ağır paket yüklendi: {', '.join(agir)}")
+        hata = True
+    if toplam_ms > args.butce_ms:
+        print(f"🔴 Bütçe aşıldı: {toplam_ms:.1f} ms > {args.butce_ms:.0f} ms")
+        hata = True
+    if not hata:
+        print("✅ Açılış bütçe içinde.")
+    return 1 if hata else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
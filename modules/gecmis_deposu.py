@@ -0,0 +1,159 @@
+import os
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+# Not: Grafiğin bozulmaması için 'SysBP' ve 'DiaBP' isimleri korunur.
+KAYIT_SUTUNLARI = [
+    "Tarih",
+    "SysBP", "DiaBP", "Risk_Skoru",  # Temel Grafikler İçin
+    "Nabiz", "Seker", "BMI", "Kilo", # Klinik Önemli
+    "Kolesterol", "LDL", "HDL", "Trigliserit", # Kan Yağları
+    "Tuz_Gr", "Sigara", "Alkol", "Uyku", "Aktivite", # Yaşam Tarzı
+    "Yas", "Cinsiyet", "Aile_Oykusu" # Demografik
+]
+METIN_SUTUNLARI = {"Sigara", "Cinsiyet", "Aile_Oykusu"}
+
+# Eski CSV dosyalarındaki tarih biçimi
+CSV_TARIH_FORMATI = "%d.%m.%Y %H:%M"
+# Veritabanında sıralanabilir olsun diye ISO biçimi kullanılır
+DB_TARIH_FORMATI = "%Y-%m-%d %H:%M"
+
+
+class GecmisDeposu:
+    """Tüm hastaların ölçüm geçmişini tek bir SQLite dosyasında tutar.
+
+    Kayıtlar (hasta, tarih) üzerinde indekslidir; bir hastanın geçmişi ya da
+    belirli bir tarih aralığı dosyanın tamamı okunmadan getirilir.
+    """
+
+    def __init__(self, db_yolu):
+        self.db_yolu = str(db_yolu)
+        self.baglanti = sqlite3.connect(self.db_yolu)
+        self.baglanti.execute("PRAGMA journal_mode=WAL")
+        self._tablolari_olustur()
+
+    def _tablolari_olustur(self):
+        sutunlar = ", ".join(
+            f"{s} {'TEXT' if s in METIN_SUTUNLARI else 'REAL'}" for s in KAYIT_SUTUNLARI[1:]
+        )
+        with self.baglanti:
+            self.baglanti.execute(
+                f"CREATE TABLE IF NOT EXISTS kayitlar (hasta TEXT NOT NULL, Tarih TEXT NOT NULL, {sutunlar})"
+            )
+            self.baglanti.execute(
+                "CREATE INDEX IF NOT EXISTS ix_kayitlar_hasta_tarih ON kayitlar (hasta, Tarih)"
+            )
+            # Aynı CSV'nin iki kez içe aktarılmasını önlemek için
+            self.baglanti.execute(
+                "CREATE TABLE IF NOT EXISTS aktarilan_dosyalar "
+                "(dosya TEXT PRIMARY KEY, boyut INTEGER, mtime INTEGER, satir INTEGER)"
+            )
+
+    def kapat(self):
+        self.baglanti.close()
+
+    # ---------------------------------------------------------
+    # YAZMA
+    # ---------------------------------------------------------
+    def _satir(self, hasta, kayit):
+        tarih = kayit["Tarih"]
+        if isinstance(tarih, str):
+            tarih = datetime.strptime(tarih, CSV_TARIH_FORMATI)
+        return (hasta, tarih.strftime(DB_TARIH_FORMATI), *(kayit.get(s) for s in KAYIT_SUTUNLARI[1:]))
+
+    def _yaz(self, hasta, kayitlar):
+        yer = ", ".join("?" * (len(KAYIT_SUTUNLARI) + 1))
+        self.baglanti.executemany(
+            f"INSERT INTO kayitlar (hasta, {', '.join(KAYIT_SUTUNLARI)}) VALUES ({yer})",
+            (self._satir(hasta, k) for k in kayitlar),
+        )
+
+    def toplu_ekle(self, hasta, kayitlar):
+        """Kayıtları tek bir işlemde ekler. Her kayıt KAYIT_SUTUNLARI anahtarlarına sahip bir sözlüktür."""
+        with self.baglanti:
+            self._yaz(hasta, kayitlar)
+
+    def ekle(self, hasta, kayit):
+        self.toplu_ekle(hasta, [kayit])
+
+    # ---------------------------------------------------------
+    # OKUMA
+    # ---------------------------------------------------------
+    def getir(self, hasta, baslangic=None, bitis=None, sonra=None, kimlik_sonra=None):
+        """Hastanın kayıtlarını tarih sırasıyla DataFrame olarak döner.
+
+        ``baslangic`` / ``bitis`` dahil tarih aralığı, ``sonra`` ise o andan
+        kesin olarak sonraki kayıtları seçer (datetime ya da ISO metin).
+        İndeks kaydın kimliğidir; ``kimlik_sonra`` verilirse sadece o kimlikten
+        sonra yazılan kayıtlar gelir (aynı dakikadaki kayıtlar da kaçmaz).
+        """
+        kosul, param = ["hasta = ?"], [hasta]
+        for sutun_kosulu, deger in (("Tarih >= ?", baslangic), ("Tarih <= ?", bitis), ("Tarih > ?", sonra),
+                                    ("rowid > ?", kimlik_sonra)):
+            if deger is not None:
+                kosul.append(sutun_kosulu)
+                param.append(deger.strftime(DB_TARIH_FORMATI) if isinstance(deger, datetime) else deger)
+
+        df = pd.read_sql_query(
+            f"SELECT rowid AS kimlik, {', '.join(KAYIT_SUTUNLARI)} FROM kayitlar "
+            f"WHERE {' AND '.join(kosul)} ORDER BY Tarih, rowid",
+            self.baglanti, params=param, index_col="kimlik",
+        )
+        df["Tarih"] = pd.to_datetime(df["Tarih"], format=DB_TARIH_FORMATI)
+        return df
+
+    def kayit_sayisi(self, hasta):
+        return self.baglanti.execute("SELECT COUNT(*) FROM kayitlar WHERE hasta = ?", (hasta,)).fetchone()[0]
+
+    # ---------------------------------------------------------
+    # ESKİ CSV DOSYALARINI İÇE AKTARMA
+    # ---------------------------------------------------------
+    def csv_ice_aktar(self, klasor):
+        """Klasördeki hasta CSV'lerini (dosya adı = hasta adı) içe aktarır.
+
+        Daha önce aktarılan dosyalar atlanır; dosyaya sonradan satır eklenmişse
+        sadece yeni satırlar aktarılır.
+        """
+        aktarilan = 0
+        for dosya in sorted(Path(klasor).glob("*.csv")):
+            st = os.stat(dosya)
+            onceki = self.baglanti.execute(
+                "SELECT boyut, mtime, satir FROM aktarilan_dosyalar WHERE dosya = ?", (str(dosya.resolve()),)
+            ).fetchone()
+            if onceki is not None and onceki[:2] == (st.st_size, st.st_mtime_ns):
+                continue
+
+            try:
+                df = pd.read_csv(dosya, dtype={s: str for s in METIN_SUTUNLARI})
+            except Exception as e:
+                print(f"İçe aktarma hatası ({dosya.name}): {e}")
+                continue
+            if "Tarih" not in df.columns:
+                continue
+            toplam = len(df)
+            # CSV'ler sadece sona eklenerek büyür; önceden aktarılan satırlar atlanır
+            df = df.iloc[onceki[2] if onceki is not None else 0:].copy()
+            # Elle düzenlenmiş dosyalarda bozuk tarihli satırlar atlanır, dosyanın geri kalanı aktarılır
+            df["Tarih"] = pd.to_datetime(df["Tarih"], format=CSV_TARIH_FORMATI, errors="coerce")
+            bozuk = int(df["Tarih"].isna().sum())
+            if bozuk:
+                print(f"İçe aktarma uyarısı ({dosya.name}): tarihi okunamayan {bozuk} satır atlandı.")
+                df = df[df["Tarih"].notna()]
+            df = df.reindex(columns=KAYIT_SUTUNLARI)
+            df = df.astype(object).where(df.notna(), None)
+
+            try:
+                with self.baglanti:
+                    self._yaz(dosya.stem, df.to_dict("records"))
+                    self.baglanti.execute(
+                        "INSERT OR REPLACE INTO aktarilan_dosyalar VALUES (?, ?, ?, ?)",
+                        (str(dosya.resolve()), st.st_size, st.st_mtime_ns, toplam),
+                    )
+            except Exception as e:
+                print(f"İçe aktarma hatası ({dosya.name}): {e}")
+                continue
+            aktarilan += len(df)
+        return aktarilan
@@ -0,0 +1,638 @@
+import matplotlib
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+import io
+import numpy as np
+import platform
+import matplotlib.dates as mdates
+import pandas as pd
+
+from modules.gecmis_deposu import CSV_TARIH_FORMATI
+from modules.izleme import izle
+
+_font_ayarlandi = False
+
+
+def _font_ayarla():
+    """Font ayarları; içe aktarmada değil, ilk grafik oluşturulurken bir kez yapılır."""
+    global _font_ayarlandi
+    if _font_ayarlandi:
+        return
+    if platform.system() == 'Windows':
+        matplotlib.rcParams['font.family'] = 'Arial'
+    else:
+        matplotlib.rcParams['font.family'] = 'DejaVu Sans'
+    _font_ayarlandi = True
+
+# Etki grafiklerinde en fazla gösterilecek faktör sayısı (17 özellik + mevcut hastalık)
+MAKS_FAKTOR = 18
+
+# Trend grafiğinde çizilecek en fazla nokta; daha uzun geçmişler özetlenir
+NOKTA_BUTCESI = 500
+# Özet seviyesi -> numpy datetime64 birimi
+KOVA_BIRIMI = {'gun': 'D', 'hafta': 'W', 'ay': 'M'}
+
+class GrafikOlusturucu:
+    """Grafikleri ekrana bağlı olmadan, Agg ile çizer (tkinter gerektirmez).
+
+    Aynı grafik tipi tekrar çizildiğinde eksenler ve çizim nesneleri yeniden
+    oluşturulmaz; sadece verileri güncellenir. Sonuç ``kaydet`` ile dosyaya
+    ya da ``bayt`` ile bellekteki PNG/SVG verisine aktarılır.
+    """
+
+    def __init__(self, figsize=(12, 8), dpi=100, sabit_yerlesim=False):
+        _font_ayarla()
+        self.fig = Figure(figsize=figsize, dpi=dpi)
+        self.fig.set_layout_engine('tight')
+        FigureCanvasAgg(self.fig)
+        # Toplu çizimde kenar boşlukları her grafik tipi için bir kez hesaplanır
+        self.sabit_yerlesim = sabit_yerlesim
+        self._duzen = None
+        self._s = {}
+        # Geçmiş trendi görünüm ayarları (düzen yeniden kurulsa da korunur)
+        self.trend_pencere = None
+        self.trend_seviye = 'otomatik'
+
+    def temizle(self):
+        self.fig.clear()
+        self._duzen = None
+        self._s = {}
+
+    def _duzen_kur(self, ad, kurucu):
+        """Grafik tipi değiştiyse figürü sıfırlayıp eksenleri bir kez kurar."""
+        if self._duzen != ad:
+            self.temizle()
+            if self.sabit_yerlesim:
+                self.fig.set_layout_engine('tight')
+            kurucu()
+            self._duzen = ad
+        return self._s
+
+    @property
+    def trend_hazir(self):
+        """Geçmiş trendi çizili ve serisi bellekte mi (``ekle=True`` ile güncellenebilir mi)."""
+        return self._duzen == 'trend' and 'veri' in self._s
+
+    def goster(self):
+        """Ekransız çizimde yapılacak bir şey yok; Tk sürümü tuvali günceller."""
+        pass
+
+    def mesaj_goster(self, metin):
+        self.temizle()
+        self.fig.text(0.5, 0.5, metin, ha='center', va='center', fontsize=12)
+        self._duzen = 'mesaj'
+        self.goster()
+
+    # ---------------------------------------------------------
+    # ÇIKTI: DOSYA / BELLEK
+    # ---------------------------------------------------------
+    def kaydet(self, hedef, format='png'):
+        """Son çizilen grafiği dosya yoluna ya da açık bir dosya nesnesine yazar."""
+        self.fig.savefig(hedef, format=format)
+        self._yerlesimi_sabitle()
+
+    @izle('grafik.bayt')
+    def bayt(self, format='png'):
+        tampon = io.BytesIO()
+        self.kaydet(tampon, format=format)
+        return tampon.getvalue()
+
+    def resim(self):
+        """Grafiği PNG'ye sıkıştırmadan, Agg tamponundan bir PIL görüntüsü olarak döner."""
+        from PIL import Image
+
+        self.fig.canvas.draw()
+        self._yerlesimi_sabitle()
+        return Image.frombuffer('RGBA', self.fig.canvas.get_width_height(),
+                                self.fig.canvas.buffer_rgba(), 'raw', 'RGBA', 0, 1).convert('RGB')
+
+    def _yerlesimi_sabitle(self):
+        if self.sabit_yerlesim and self.fig.get_layout_engine() is not None:
+            # İlk çizimde hesaplanan kenar boşlukları korunur; aynı tipteki sonraki grafikler yeniden hesaplamaz
+            self.fig.set_layout_engine('none')
+
+    # ---------------------------------------------------------
+    # YARDIMCI: UZUN ETİKETLERİ BÖLME FONKSİYONU
+    # ---------------------------------------------------------
+    def etiket_bol(self, metin):
+        """Uzun etiketleri \n ile iki satıra böler."""
+        mapping = {
+            'Büyük Tansiyon': 'Büyük\nTansiyon',
+            'Küçük Tansiyon': 'Küçük\nTansiyon',
+            'Kilo (BMI)': 'Kilo\n(BMI)',
+            'Tansiyon Hastalığı': 'Tansiyon\nHastalığı',
+            'Diyabet Hastalığı': 'Diyabet\nHastalığı',
+            'Genetik': 'Genetik\nÖykü',
+            'Hareketsizlik': 'Fiziksel\nHareketsizlik',
+            'Tuz': 'Tuz\nTüketimi'
+        }
+        return mapping.get(metin, metin)
+
+    # ---------------------------------------------------------
+    # YARDIMCI: ÇİZİM NESNELERİNİ GÜNCELLEME
+    # ---------------------------------------------------------
+    def _noktalar(self, df, x_col, y_col):
+        if df is None or df.empty:
+            return np.empty((0, 2))
+        return np.column_stack([df[x_col].to_numpy(dtype=float), df[y_col].to_numpy(dtype=float)])
+
+    def _dagilim_guncelle(self, ax, sanatcilar, sagliklilar, hastalar, kullanici):
+        """Sağlıklı / hasta / kullanıcı noktalarını günceller ve eksen sınırlarını yeniden hesaplar."""
+        sc_saglam, sc_hasta, sc_siz = sanatcilar
+        sc_saglam.set_offsets(sagliklilar)
+        sc_hasta.set_offsets(hastalar)
+        sc_siz.set_offsets(kullanici)
+        ax.ignore_existing_data_limits = True
+        ax.update_datalim(np.vstack([sagliklilar, hastalar, kullanici]))
+        ax.autoscale_view()
+
+    def _faktor_cubuklari(self, ax, yatay):
+        konum = np.arange(MAKS_FAKTOR)
+        bos = np.zeros(MAKS_FAKTOR)
+        return ax.barh(konum, bos) if yatay else ax.bar(konum, bos)
+
+    def _faktor_guncelle(self, ax, cubuklar, faktorler, yatay):
+        """Önceden oluşturulmuş çubukları faktör sayısı kadar gösterir, kalanları gizler."""
+        k = [self.etiket_bol(x[0]) for x in faktorler]
+        v = [x[1] for x in faktorler]
+        for i, cubuk in enumerate(cubuklar):
+            if i < len(v):
+                if yatay: cubuk.set_width(v[i])
+                else: cubuk.set_height(v[i])
+                cubuk.set_color('#e74c3c' if v[i] > 0 else '#2ecc71')
+                cubuk.set_visible(True)
+            else:
+                cubuk.set_visible(False)
+
+        ust = max(len(k), 1) - 0.5
+        if yatay:
+            ax.set_yticks(range(len(k)), k)
+            ax.set_ylim(ust, -0.5)
+        else:
+            ax.set_xticks(range(len(k)), k)
+            ax.set_xlim(-0.5, ust)
+        ax.relim(visible_only=True)
+        ax.autoscale_view(scalex=yatay, scaley=not yatay)
+
+    # ---------------------------------------------------------
+    # SENARYO 1 & 2: TEKİL RİSK
+    # ---------------------------------------------------------
+    def _kur_tekil(self):
+        s = self._s
+        gs = self.fig.add_gridspec(2, 2, width_ratios=[1.2, 0.8])
+
+        ax1 = self.fig.add_subplot(gs[0, 0]) # Konum Grafiği
+        ax2 = self.fig.add_subplot(gs[0, 1]) # Risk Göstergesi
+        ax3 = self.fig.add_subplot(gs[1, :]) # Etki Faktörleri
+
+        # 1. KONUM GRAFİĞİ
+        bos = np.empty((0, 2))
+        s['konum'] = (
+            ax1.scatter(bos[:, 0], bos[:, 1], c='#2ecc71', alpha=0.5, s=40, label='Sağlıklı Benzerler'),
+            ax1.scatter(bos[:, 0], bos[:, 1], c='#e74c3c', alpha=0.6, s=40, label='Hasta Benzerler'),
+            ax1.scatter(bos[:, 0], bos[:, 1], c='gold', s=400, marker='*',
+                        edgecolor='black', zorder=10, label='SİZ (Konumunuz)'),
+        )
+        ax1.set_xlabel("Yaş")
+        ax1.set_title("Sizin Gibi Kişiler Arasındaki Konumunuz", fontsize=10, fontweight='bold')
+        ax1.legend(loc='upper left', frameon=True, fontsize=9)
+        ax1.grid(alpha=0.3, linestyle='--')
+
+        # 2. RİSK GÖSTERGESİ
+        s['risk_bar'] = ax2.bar(["RİSK SKORU"], [0], width=0.4)[0]
+        ax2.set_ylim(0, 100)
+        ax2.axhline(50, color='red', ls='--', label='Yüksek Risk Sınırı')
+        s['risk_yazi'] = ax2.text(0, 2, '', ha='center', fontweight='bold', fontsize=14)
+
+        # 3. ETKİ FAKTÖRLERİ
+        s['faktorler'] = self._faktor_cubuklari(ax3, yatay=False)
+        ax3.set_title("Sizin Verilerinizin Riske Olan NET KATKISI (Sıfırın üstü riski artırır)", fontsize=11)
+        ax3.axhline(0, color='black', linewidth=1)
+        ax3.tick_params(axis='x', labelsize=9)
+        ax3.grid(axis='y', alpha=0.3)
+
+        s['ax'] = (ax1, ax2, ax3)
+
+    @izle('grafik.ciz_tekil_risk_analizi')
+    def ciz_tekil_risk_analizi(self, df_similar, user_x, user_y, risk_score, etki_dict, mod="dm"):
+        s = self._duzen_kur('tekil', self._kur_tekil)
+        ax1, ax2, ax3 = s['ax']
+
+        if mod == "dm":
+            y_col, y_label, target_col = "Glucose", "Açlık Şekeri", "Target_DM"
+        else: # htn
+            y_col, y_label, target_col = "Systolic_BP", "Büyük Tansiyon", "Target_HTN"
+
+        # 1. KONUM GRAFİĞİ
+        if df_similar is not None and not df_similar.empty:
+            hasta_mi = df_similar[target_col].to_numpy() == 1
+            noktalar = self._noktalar(df_similar, 'Age', y_col)
+            sagliklilar, hastalar = noktalar[~hasta_mi], noktalar[hasta_mi]
+        else:
+            sagliklilar = hastalar = np.empty((0, 2))
+        self._dagilim_guncelle(ax1, s['konum'], sagliklilar, hastalar, [[user_x, user_y]])
+        ax1.set_ylabel(y_label)
+
+        # 2. RİSK GÖSTERGESİ
+        risk_color = '#2ecc71' if risk_score < 40 else '#f39c12' if risk_score < 70 else '#c0392b'
+        s['risk_bar'].set_height(risk_score)
+        s['risk_bar'].set_color(risk_color)
+        s['risk_yazi'].set_position((0, risk_score + 2))
+        s['risk_yazi'].set_text(f'%{risk_score:.1f}')
+        ax2.set_title(f"HESAPLANAN {'DİYABET' if mod=='dm' else 'TANSİYON'} RİSKİ")
+
+        # 3. ETKİ FAKTÖRLERİ
+        sorted_factors = sorted(etki_dict.items(), key=lambda x: x[1], reverse=True)
+        self._faktor_guncelle(ax3, s['faktorler'], sorted_factors, yatay=False)
+
+        self.goster()
+
+    # ---------------------------------------------------------
+    # SENARYO 3: İKİLİ RİSK
+    # ---------------------------------------------------------
+    def _kur_ikili(self):
+        s = self._s
+        gs = self.fig.add_gridspec(3, 2)
+        bos = np.empty((0, 2))
+
+        def konum_ekseni(hucre, hasta_etiketi, baslik, y_etiketi):
+            ax = self.fig.add_subplot(hucre)
+            s[ax] = (
+                ax.scatter(bos[:, 0], bos[:, 1], c='#2ecc71', alpha=0.4, s=30, label='Sağlıklı'),
+                ax.scatter(bos[:, 0], bos[:, 1], c='#e74c3c', alpha=0.4, s=30, label=hasta_etiketi),
+                ax.scatter(bos[:, 0], bos[:, 1], c='gold', s=300, marker='*', edgecolor='black', label='SİZ'),
+            )
+            ax.set_title(baslik)
+            ax.set_ylabel(y_etiketi)
+            ax.legend(loc='upper left', fontsize=8)
+            return ax
+
+        # A) TANSİYON GRAFİĞİ
+        ax_pos_bp = konum_ekseni(gs[0, 0], 'Tansiyon Hastası', "Benzer Grubunuzda Tansiyon", "Büyük Tansiyon")
+        # B) ŞEKER GRAFİĞİ
+        ax_pos_gl = konum_ekseni(gs[0, 1], 'Diyabet Hastası', "Benzer Grubunuzda Şeker", "Açlık Şekeri")
+
+        # C) RİSK BARLARI
+        ax_risk = self.fig.add_subplot(gs[1, :])
+        s['risk_barlar'] = ax_risk.bar(["Tansiyon Riski", "Diyabet Riski"], [0, 0],
+                                       color=['#e74c3c', '#3498db'], width=0.3)
+        ax_risk.set_ylim(0, 100)
+        ax_risk.axhline(50, color='gray', ls='--')
+        s['risk_yazilar'] = [ax_risk.text(i, 1, '', ha='center', fontsize=12, fontweight='bold') for i in range(2)]
+        ax_risk.set_title("Hesaplanan Riskler")
+
+        # D) ETKİLER
+        ax_fac_htn = self.fig.add_subplot(gs[2, 0])
+        ax_fac_dm = self.fig.add_subplot(gs[2, 1])
+        for ax, title in ((ax_fac_htn, "Tansiyon Riskini En Çok Etkileyenler"),
+                          (ax_fac_dm, "Diyabet Riskini En Çok Etkileyenler")):
+            s[ax] = self._faktor_cubuklari(ax, yatay=True)
+            ax.set_title(title)
+            ax.axvline(0, color='black', lw=0.8)
+            ax.tick_params(axis='y', labelsize=9)
+
+        s['ax'] = (ax_pos_bp, ax_pos_gl, ax_risk, ax_fac_htn, ax_fac_dm)
+
+    @izle('grafik.ciz_ikili_risk_dashboard')
+    def ciz_ikili_risk_dashboard(self, df_similar, user_age, user_bp, user_glc, risk_htn, risk_dm, etki_htn, etki_dm):
+        s = self._duzen_kur('ikili', self._kur_ikili)
+        ax_pos_bp, ax_pos_gl, ax_risk, ax_fac_htn, ax_fac_dm = s['ax']
+
+        # A) TANSİYON  /  B) ŞEKER GRAFİĞİ
+        for ax, y_col, target_col, user_y in ((ax_pos_bp, 'Systolic_BP', 'Target_HTN', user_bp),
+                                              (ax_pos_gl, 'Glucose', 'Target_DM', user_glc)):
+            if df_similar is not None:
+                hasta_mi = df_similar[target_col].to_numpy() == 1
+                noktalar = self._noktalar(df_similar, 'Age', y_col)
+                self._dagilim_guncelle(ax, s[ax], noktalar[~hasta_mi], noktalar[hasta_mi], [[user_age, user_y]])
+            else:
+                self._dagilim_guncelle(ax, s[ax], np.empty((0, 2)), np.empty((0, 2)), np.empty((0, 2)))
+
+        # C) RİSK BARLARI
+        for i, risk in enumerate((risk_htn, risk_dm)):
+            s['risk_barlar'][i].set_height(risk)
+            s['risk_yazilar'][i].set_position((i, risk + 1))
+            s['risk_yazilar'][i].set_text(f"%{risk:.1f}")
+
+        # D) ETKİLER (En etkili 7 faktör)
+        for ax, effects in ((ax_fac_htn, etki_htn), (ax_fac_dm, etki_dm)):
+            sorted_f = sorted(effects.items(), key=lambda x: abs(x[1]), reverse=True)[:7]
+            self._faktor_guncelle(ax, s[ax], sorted_f, yatay=True)
+
+        self.goster()
+
+    # ---------------------------------------------------------
+    # SENARYO 4: SAĞLIK YÖNETİMİ (İKİSİ DE VAR)
+    # ---------------------------------------------------------
+    METRIKLER = [
+        ('Sys BP', 'Systolic_BP', 120, 140),
+        ('Dia BP', 'Diastolic_BP', 80, 90),
+        ('Açlık Şekeri', 'Glucose', 90, 120),
+        ('BMI', 'BMI', 22, 25),
+        ('LDL Kolesterol', 'LDL', 100, 130),
+        ('Trigliserit', 'Triglycerides', 150, 200)
+    ]
+
+    def _kur_yonetim(self):
+        s = self._s
+        ax = self.fig.add_subplot()
+        s['kirmizi'], s['nokta'], s['yazi'] = [], [], []
+        for i, (name, _, target, limit) in enumerate(self.METRIKLER):
+            ax.barh(i, target, color='#2ecc71', alpha=0.3, height=0.6, align='center',
+                    label='İdeal Aralık' if i==0 else "")
+
+            ax.barh(i, limit-target, left=target, color='#f1c40f', alpha=0.3, height=0.6, align='center',
+                    label='Dikkat' if i==0 else "")
+
+            s['kirmizi'].append(ax.barh(i, limit*0.5, left=limit, color='#e74c3c', alpha=0.2, height=0.6,
+                                        align='center', label='Yüksek Risk' if i==0 else "")[0])
+            s['nokta'].append(ax.plot([limit], [i], 'o', markersize=12, markeredgecolor='black')[0])
+            s['yazi'].append(ax.text(limit, i + 0.2, '', ha='center', fontweight='bold', color='black'))
+
+        ax.set_yticks(np.arange(len(self.METRIKLER)))
+        ax.set_yticklabels([m[0] for m in self.METRIKLER])
+        ax.set_title("MEVCUT SAĞLIK DURUMU vs İDEAL HEDEFLER")
+        ax.legend(loc='upper right')
+        s['ax'] = ax
+
+    @izle('grafik.ciz_saglik_yonetimi')
+    def ciz_saglik_yonetimi(self, user_vals):
+        s = self._duzen_kur('yonetim', self._kur_yonetim)
+        for i, (_, key, target, limit) in enumerate(self.METRIKLER):
+            val = user_vals[key]
+            s['kirmizi'][i].set_width(max(val, limit*1.5)-limit)
+            color = 'green' if val <= target else 'orange' if val <= limit else 'red'
+            s['nokta'][i].set_data([val], [i])
+            s['nokta'][i].set_color(color)
+            s['nokta'][i].set_markeredgecolor('black')
+            s['yazi'][i].set_position((val, i + 0.2))
+            s['yazi'][i].set_text(f"{int(val)}")
+
+        s['ax'].relim()
+        s['ax'].autoscale_view()
+        self.goster()
+
+    # ---------------------------------------------------------
+    # ANALİZ SONUCUNA GÖRE GRAFİK SEÇİMİ (Arayüz ve PDF raporu ortak)
+    # ---------------------------------------------------------
+    def ciz_analiz_sonucu(self, sonuc):
+        """analiz_yap sonuç kaydındaki senaryoya uygun grafiği çizer."""
+        vals = sonuc['vals']
+        has_htn, has_dm = sonuc['has_htn'], sonuc['has_dm']
+
+        if has_htn and not has_dm:
+            self.ciz_tekil_risk_analizi(
+                df_similar=sonuc['df_benzer'],
+                user_x=vals['age'],
+                user_y=vals['glucose'],
+                risk_score=sonuc['risk_dm'],
+                etki_dict=sonuc['etkiler'],
+                mod="dm"
+            )
+        elif not has_htn and has_dm:
+            self.ciz_tekil_risk_analizi(
+                df_similar=sonuc['df_benzer'],
+                user_x=vals['age'],
+                user_y=vals['sysBP'],
+                risk_score=sonuc['risk_htn'],
+                etki_dict=sonuc['etkiler'],
+                mod="htn"
+            )
+        elif not has_htn and not has_dm:
+            self.ciz_ikili_risk_dashboard(
+                df_similar=sonuc['df_benzer'],
+                user_age=vals['age'],
+                user_bp=vals['sysBP'],
+                user_glc=vals['glucose'],
+                risk_htn=sonuc['risk_htn'],
+                risk_dm=sonuc['risk_dm'],
+                etki_htn=sonuc['etkiler_htn'],
+                etki_dm=sonuc['etkiler_dm']
+            )
+        else:
+            self.ciz_saglik_yonetimi(sonuc['user_data'])
+
+    # ---------------------------------------------------------
+    # GÜNCELLENEN FONKSİYON: ÇİFT EKSENLİ TREND GRAFİĞİ
+    # ---------------------------------------------------------
+    def _kur_trend(self):
+        s = self._s
+        ax1 = self.fig.add_subplot()
+
+        # -----------------------------------------------------
+        # SOL EKSEN (AX1) - TANSİYON VERİLERİ
+        # -----------------------------------------------------
+        ln1 = ax1.plot([], [], color='#c0392b', marker='o', linewidth=2, label='Büyük Tansiyon')
+        ln2 = ax1.plot([], [], color='#2980b9', marker='o', linewidth=2, label='Küçük Tansiyon')
+
+        # Hipertansiyon Sınırı (140)
+        ln3 = ax1.axhline(y=140, color='gray', linestyle='--', alpha=0.5, label='Hipertansiyon Sınırı (140)')
+
+        ax1.set_ylabel("Tansiyon (mmHg)", fontweight='bold')
+        ax1.set_xlabel("Tarih", fontweight='bold')
+        ax1.grid(True, alpha=0.3)
+
+        # -----------------------------------------------------
+        # SAĞ EKSEN (AX2) - RİSK SKORU
+        # -----------------------------------------------------
+        ax2 = ax1.twinx()  # X eksenini paylaşan ikinci bir Y ekseni yarat
+
+        ln4 = ax2.plot([], [], color='#8e44ad', linestyle='--', marker='.', label='Risk Skoru (%)')
+
+        ax2.set_ylabel("Risk Skoru (%)", color='#8e44ad', fontweight='bold')
+        ax2.tick_params(axis='y', labelcolor='#8e44ad')
+        ax2.set_ylim(0, 100)  # Risk skoru her zaman 0-100 arasındadır
+
+        # -----------------------------------------------------
+        # ORTAK LEJANT (İKİ EKSENİ BİRLEŞTİRME)
+        # -----------------------------------------------------
+        # Matplotlib'de iki eksen olunca lejantlar ayrı düşer, onları topluyoruz:
+        lines = ln1 + ln2 + [ln3] + ln4
+        labels = [l.get_label() for l in lines]
+        ax1.legend(lines, labels, loc='upper left', frameon=True, fancybox=True, framealpha=0.9)
+
+        # -----------------------------------------------------
+        # TARİH FORMATI VE BAŞLIK
+        # -----------------------------------------------------
+        ax1.xaxis_date()
+        # Her ölçüme bir etiket yerine, aralığa göre seyreltilmiş tarih etiketleri
+        ax1.xaxis.set_major_locator(mdates.AutoDateLocator(minticks=3, maxticks=10))
+        ax1.xaxis.set_major_formatter(mdates.DateFormatter('%d-%m-%Y\n%H:%M'))
+        ax1.set_title("Tansiyon Takip Grafiği ve Risk Analizi", fontsize=12, fontweight='bold')
+
+        s['ax'] = (ax1, ax2)
+        s['cizgiler'] = (ln1[0], ln2[0], ln4[0])
+
+    def _trend_dizileri(self, df):
+        """Geçmiş tablosunu çizgilerin kullandığı sayısal dizilere çevirir."""
+        tarih = df['Tarih']
+        if not pd.api.types.is_datetime64_any_dtype(tarih):
+            tarih = pd.to_datetime(tarih, format=CSV_TARIH_FORMATI)
+        sys_bp = df['SysBP'].to_numpy(dtype=float)
+        dia_bp = df['DiaBP'].to_numpy(dtype=float)
+
+        # Kayıtlarda risk skoru yoksa (eski dosyalar) tansiyondan temsili bir değer çizilir
+        if 'Risk_Skoru' in df.columns:
+            risk = df['Risk_Skoru'].to_numpy(dtype=float)
+        else:
+            risk = (sys_bp + dia_bp) / 4  # Temsili hesap
+        return {
+            'zaman': tarih.to_numpy(dtype='datetime64[ns]'), 'tarih': mdates.date2num(tarih),
+            'sys': sys_bp, 'dia': dia_bp, 'risk': risk,
+        }
+
+    def trend_gorunumu(self, pencere=None, seviye=None):
+        """Tarih penceresini / ayrıntı seviyesini değiştirip bellekteki seriyi yeniden çizer.
+
+        ``pencere``: (başlangıç, bitiş) datetime çifti; iki uç da None olabilir.
+        ``seviye``: 'otomatik', 'ham', 'gun', 'hafta', 'ay' ya da 'lttb'.
+        """
+        self.trend_pencere = pencere
+        if seviye is not None:
+            self.trend_seviye = seviye
+        if self.trend_hazir:
+            self._trend_ciz()
+
+    def _trend_secimi(self, veri):
+        """Penceredeki kayıtları ve kullanılacak ayrıntı seviyesini döner."""
+        bas, son = 0, len(veri['tarih'])
+        if self.trend_pencere is not None:
+            alt, ust = self.trend_pencere
+            if alt is not None:
+                bas = np.searchsorted(veri['tarih'], mdates.date2num(alt), side='left')
+            if ust is not None:
+                son = np.searchsorted(veri['tarih'], mdates.date2num(ust), side='right')
+        secili = {k: v[bas:son] for k, v in veri.items()}
+
+        seviye = self.trend_seviye
+        if seviye == 'otomatik':
+            seviye = 'ham'
+            if son - bas > NOKTA_BUTCESI:
+                # Nokta bütçesine sığan en ince zaman aralığı; hiçbiri sığmıyorsa LTTB
+                seviye = 'lttb'
+                for aday in ('gun', 'hafta', 'ay'):
+                    if len(np.unique(_kovalar(secili['zaman'], aday))) <= NOKTA_BUTCESI:
+                        seviye = aday
+                        break
+        return secili, seviye
+
+    def _trend_ciz(self):
+        s = self._s
+        ax1, ax2 = s['ax']
+        ln_sys, ln_dia, ln_risk = s['cizgiler']
+        for bant in s.pop('bantlar', []):
+            bant.remove()
+
+        veri, seviye = self._trend_secimi(s['veri'])
+        if seviye in KOVA_BIRIMI:
+            # Her gün / hafta / ay için ortalama çizgisi ve min-max bandı
+            kova = _kovalar(veri['zaman'], seviye)
+            ozet = pd.DataFrame({k: veri[k] for k in ('tarih', 'sys', 'dia', 'risk')}).groupby(kova)
+            ort, en_az, en_cok = ozet.mean(), ozet.min(), ozet.max()
+            x = ort['tarih'].to_numpy()
+            y = {k: ort[k].to_numpy() for k in ('sys', 'dia', 'risk')}
+            s['bantlar'] = [
+                ax.fill_between(x, en_az[k].to_numpy(), en_cok[k].to_numpy(), color=ln.get_color(), alpha=0.15, linewidth=0)
+                for ax, ln, k in ((ax1, ln_sys, 'sys'), (ax1, ln_dia, 'dia'), (ax2, ln_risk, 'risk'))
+            ]
+        else:
+            sira = slice(None)
+            if seviye == 'lttb':
+                gecerli = np.flatnonzero(np.isfinite(veri['sys']))
+                sira = gecerli[lttb(veri['tarih'][gecerli], veri['sys'][gecerli], NOKTA_BUTCESI)]
+            x = veri['tarih'][sira]
+            y = {k: veri[k][sira] for k in ('sys', 'dia', 'risk')}
+
+        # İşaretçiler sadece ham ölçümlerde gösterilir
+        ham = seviye == 'ham'
+        ln_sys.set_marker('o' if ham else 'None')
+        ln_dia.set_marker('o' if ham else 'None')
+        ln_risk.set_marker('.' if ham else 'None')
+        ln_sys.set_data(x, y['sys'])
+        ln_dia.set_data(x, y['dia'])
+        ln_risk.set_data(x, y['risk'])
+
+        ax1.set_autoscalex_on(True)
+        ax1.relim()
+        ax1.autoscale_view()
+        if len(x) and self.trend_pencere is not None:
+            alt, ust = self.trend_pencere
+            ax1.set_xlim(mdates.date2num(alt) if alt is not None else x[0],
+                         mdates.date2num(ust) if ust is not None else x[-1])
+        for etiket in ax1.get_xticklabels():
+            etiket.set_rotation(45)
+            etiket.set_ha("right")
+        self.goster()
+
+    @izle('grafik.ciz_gecmis_trend')
+    def ciz_gecmis_trend(self, df, ekle=False):
+        """Geçmiş trendini çizer.
+
+        ``ekle=True`` ise ``df`` sadece son çizimden sonra gelen kayıtları içerir;
+        bunlar bellekteki seriye eklenir ve mevcut çizgiler güncellenir. Çok sayıda
+        kayıt varsa ``trend_gorunumu`` ayarlarına göre özetlenerek çizilir.
+
+        Trend çizildiyse (ya da zaten güncelse) True döner. ``ekle=True`` iken
+        bellekte seri yoksa hiçbir şey çizmeden False döner; çağıran tüm geçmişi
+        yeniden okumalıdır.
+        """
+        if ekle and not self.trend_hazir:
+            return False
+        onceki = self._s['veri'] if ekle else None
+        if (df is None or df.empty) and onceki is None:
+            self.mesaj_goster("Henüz kaydedilmiş veri yok.")
+            return False
+
+        try:
+            if df is None or df.empty:
+                # Yeni kayıt yok; çizim zaten güncel
+                self.goster()
+                return True
+
+            # 1. Veri Hazırlığı
+            veri = self._trend_dizileri(df)
+            if onceki is not None:
+                veri = {k: np.concatenate([onceki[k], veri[k]]) for k in veri}
+            if np.any(np.diff(veri['tarih']) < 0):
+                sira = np.argsort(veri['tarih'], kind='stable')
+                veri = {k: v[sira] for k, v in veri.items()}
+
+            s = self._duzen_kur('trend', self._kur_trend)
+            s['veri'] = veri
+            self._trend_ciz()
+            return True
+
+        except Exception as e:
+            print(f"Grafik çizim hatası: {e}")
+            # Yarım kalan seri tutulmaz; bir sonraki çizim tüm geçmişi yeniden okur
+            self._s.pop('veri', None)
+            self.mesaj_goster(f"Grafik Hatası: {e}")
+            return False
+
+
+def _kovalar(zaman, seviye):
+    """Zaman damgalarını gün / hafta / ay kovalarına yuvarlar (haftalar pazartesi başlar)."""
+    if seviye == 'hafta':
+        # datetime64[W] haftaları 1970-01-01 perşembesinden sayar; 3 gün kaydırılır
+        zaman = zaman + np.timedelta64(3, 'D')
+    return zaman.astype(f'datetime64[{KOVA_BIRIMI[seviye]}]')
+
+
+def lttb(x, y, butce):
+    """Largest-Triangle-Three-Buckets: çizginin şeklini koruyan ``butce`` noktanın indekslerini döner."""
+    n = len(x)
+    if butce >= n or butce < 3:
+        return np.arange(n)
+    # İlk ve son nokta sabit; aradaki noktalar butce - 2 kovaya bölünür
+    kenarlar = np.linspace(1, n - 1, butce - 1).astype(np.intp)
+    secim = np.empty(butce, dtype=np.intp)
+    secim[0], secim[-1] = 0, n - 1
+    a = 0
+    for i in range(butce - 2):
+        bas, son = kenarlar[i], kenarlar[i + 1]
+        sonraki = slice(son, kenarlar[i + 2] if i + 2 < len(kenarlar) else n)
+        cx, cy = x[sonraki].mean(), y[sonraki].mean()
+        alan = np.abs((x[a] - cx) * (y[bas:son] - y[a]) - (x[a] - x[bas:son]) * (cy - y[a]))
+        a = bas + int(np.argmax(alan))
+        secim[i + 1] = a
+    return secim
@@ -0,0 +1,176 @@
+"""İsteğe bağlı süre ölçümü (izleme aralıkları).
+
+Kapalıyken ``aralik`` paylaşılan boş bir bağlam döner, ``izle`` sadece bir
+bayrak kontrolü ekler. Açmak için ``SAGLIK_IZLEME=1`` ortam değişkeni ya da
+``etkinlestir()`` kullanılır; oturum sonunda özet ``SAGLIK_IZLEME_DOSYA``
+(varsayılan: izleme_ozeti.json) dosyasına yazılır.
+
+Aralıklar iç içe olduğunda adlar birleşir: ``analiz_hesapla/kohort``.
+``profil_iste`` ile adı verilen aralığın bir sonraki çalışması cProfile ile
+kaydedilir.
+"""
+import atexit
+import bisect
+import cProfile
+import functools
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import nullcontext
+
+# Histogram kova üst sınırları (ms)
+HISTOGRAM_SINIRLARI_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+VARSAYILAN_DOSYA = 'izleme_ozeti.json'
+
+_etkin = False
+_dosya = None
+_kilit = threading.Lock()
+_sureler = defaultdict(list)
+_profil_istekleri = {}
+_yerel = threading.local()
+_BOS = nullcontext()
+
+
+def etkin():
+    return _etkin
+
+
+def etkinlestir(dosya=None):
+    """Ölçümü açar; ``dosya`` verilirse (ya da ortam değişkeninden) çıkışta özet yazılır."""
+    global _etkin, _dosya
+    if not _etkin:
+        atexit.register(_cikista_yaz)
+    _etkin = True
+    _dosya = dosya or _dosya or os.environ.get('SAGLIK_IZLEME_DOSYA') or VARSAYILAN_DOSYA
+
+
+def sifirla():
+    with _kilit:
+        _sureler.clear()
+        _profil_istekleri.clear()
+
+
+def profil_iste(ad, dosya):
+    """``ad`` aralığının bir sonraki çalışmasını cProfile ile ``dosya``ya kaydeder."""
+    with _kilit:
+        _profil_istekleri[ad] = str(dosya)
+
+
+def sure_ekle(ad, sure):
+    """İş parçacıkları arasında dağılan bir süreyi (saniye) doğrudan kaydeder."""
+    if _etkin:
+        with _kilit:
+            _sureler[ad].append(sure)
+
+
+class _Aralik:
+    __slots__ = ('ad', 'bas', 'profil', 'profil_dosyasi')
+
+    def __init__(self, ad):
+        self.ad = ad
+
+    def __enter__(self):
+        yigin = getattr(_yerel, 'yigin', None)
+        if yigin is None:
+            yigin = _yerel.yigin = []
+        if yigin:
+            self.ad = f"{yigin[-1]}/{self.ad}"
+        yigin.append(self.ad)
+
+        self.profil = None
+        if _profil_istekleri:
+            with _kilit:
+                self.profil_dosyasi = _profil_istekleri.pop(self.ad, None)
+            if self.profil_dosyasi:
+                self.profil = cProfile.Profile()
+                try:
+                    self.profil.enable()
+                except ValueError:
+                    # Bu iş parçacığında başka bir profil zaten çalışıyor
+                    self.profil = None
+        self.bas = time.perf_counter()
+        return self
+
+    def __exit__(self, *hata):
+        sure = time.perf_counter() - self.bas
+        if self.profil is not None:
+            self.profil.disable()
+            self.profil.dump_stats(self.profil_dosyasi)
+        _yerel.yigin.pop()
+        with _kilit:
+            _sureler[self.ad].append(sure)
+        return False
+
+
+def aralik(ad):
+    """``with aralik('kohort'):`` bloğunun süresini kaydeder (kapalıyken maliyetsiz)."""
+    return _Aralik(ad) if _etkin else _BOS
+
+
+def izle(ad=None):
+    """Fonksiyonun her çağrısını bir aralık olarak kaydeden dekoratör."""
+    def sarmala(f):
+        isim = ad or f.__name__
+
+        @functools.wraps(f)
+        def ic(*args, **kwargs):
+            if not _etkin:
+                return f(*args, **kwargs)
+            with _Aralik(isim):
+                return f(*args, **kwargs)
+        return ic
+    return sarmala
+
+
+def _yuzdelik(sirali, oran):
+    if not sirali:
+        return 0.0
+    return sirali[min(len(sirali) - 1, int(round(oran * (len(sirali) - 1))))]
+
+
+def ozet():
+    """Aralık adı -> adet, toplam / ortalama / yüzdelik süreler (ms) ve histogram."""
+    with _kilit:
+        kopya = {ad: list(s) for ad, s in _sureler.items()}
+
+    sonuc = {}
+    for ad, sureler in sorted(kopya.items()):
+        ms = sorted(s * 1e3 for s in sureler)
+        kovalar = [0] * (len(HISTOGRAM_SINIRLARI_MS) + 1)
+        for m in ms:
+            kovalar[bisect.bisect_left(HISTOGRAM_SINIRLARI_MS, m)] += 1
+        etiketler = [f"<={s}ms" for s in HISTOGRAM_SINIRLARI_MS] + [f">{HISTOGRAM_SINIRLARI_MS[-1]}ms"]
+        sonuc[ad] = {
+            'adet': len(ms),
+            'toplam_ms': sum(ms),
+            'ort_ms': sum(ms) / len(ms),
+            'p50_ms': _yuzdelik(ms, 0.50),
+            'p90_ms': _yuzdelik(ms, 0.90),
+            'p99_ms': _yuzdelik(ms, 0.99),
+            'maks_ms': ms[-1],
+            'histogram': {e: n for e, n in zip(etiketler, kovalar) if n},
+        }
+    return sonuc
+
+
+def disa_aktar(dosya=None):
+    """Özeti JSON olarak yazar, yazılan yolu döner."""
+    dosya = dosya or _dosya or VARSAYILAN_DOSYA
+    with open(dosya, 'w', encoding='utf-8') as f:
+        json.dump({'zaman': time.strftime('%Y-%m-%dT%H:%M:%S'), 'pid': os.getpid(), 'araliklar': ozet()},
+                  f, ensure_ascii=False, indent=2)
+    return dosya
+
+
+def _cikista_yaz():
+    if _etkin and _sureler:
+        try:
+            print(f"ℹ️ İzleme özeti yazıldı: {disa_aktar()}")
+        except Exception as e:
+            print(f"İzleme özeti yazılamadı: {e}")
+
+
+if os.environ.get('SAGLIK_IZLEME', '') not in ('', '0'):
+    etkinlestir()
@@ -0,0 +1,224 @@
+"""Hasta kayıt klasörünü kohort analizi için toplu okuma.
+
+Klasörde hasta başına bir CSV bulunur (dosya adı = hasta adı). Dosyalar bir iş
+parçacığı havuzunda bayt olarak okunur; aynı başlığa sahip dosyalar birleştirilip
+parça başına tek bir ``read_csv`` ile ayrıştırılır. Böylece on binlerce küçük
+dosyada dosya başına ayrıştırıcı kurulumu ödenmez. Tarih sütunu ve Türkçe
+kategorik sütunlar (Sigara, Cinsiyet, Aile_Oykusu) da parça başına bir kez
+dönüştürülür.
+
+    from modules.kohort_yukleyici import kohort_oku, kohort_akisi
+    df = kohort_oku("hasta_saglik_kayitlari")              # tek tablo
+    for parca in kohort_akisi("hasta_saglik_kayitlari"):   # sınırlı bellekle akış
+        ...
+
+    python -m modules.kohort_yukleyici hasta_saglik_kayitlari -o kohort.csv
+"""
+import argparse
+import io
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from modules.gecmis_deposu import CSV_TARIH_FORMATI, KAYIT_SUTUNLARI, METIN_SUTUNLARI
+from modules.izleme import izle
+from modules.veri_isleme import SIGARA_KODLARI
+
+# Bir akış parçasında ayrıştırılacak dosya sayısı
+PARCA_DOSYA = 2000
+
+# Kategorik sütunların geçerli değerleri (sıra anlamlıdır: Sigara kodları 0/1/2)
+KATEGORILER = {
+    'Sigara': list(SIGARA_KODLARI),
+    'Cinsiyet': ['Kadın', 'Erkek'],
+    'Aile_Oykusu': ['Hayır', 'Evet'],
+}
+KOHORT_SUTUNLARI = ['Hasta'] + KAYIT_SUTUNLARI
+
+# Başka araçlardan gelen dosyalarda Türkçe harfler ASCII yazılmış olabilir
+_SADELESTIR = str.maketrans('ıİşŞğĞüÜöÖçÇ', 'iisSgGuUoOcC')
+
+
+def _sadelestir(deger):
+    return str(deger).strip().translate(_SADELESTIR).lower()
+
+
+_KATEGORI_ANAHTARLARI = {
+    sutun: {_sadelestir(e): e for e in etiketler} for sutun, etiketler in KATEGORILER.items()
+}
+
+
+def dosyalari_bul(klasor):
+    """Klasördeki hasta CSV'lerini ada göre sıralı döner."""
+    with os.scandir(klasor) as girdiler:
+        return sorted(
+            (Path(g.path) for g in girdiler if g.is_file() and g.name.lower().endswith('.csv')),
+            key=lambda p: p.name,
+        )
+
+
+def normallestir(df):
+    """Kohort tablosunu ortak düzene getirir.
+
+    Tarih datetime'a, Sigara / Cinsiyet / Aile_Oykusu sabit kategorilere (tanınmayan
+    değer -> NaN), sayısal sütunlar sayıya, Hasta kategoriye çevrilir.
+    """
+    df = df.reindex(columns=KOHORT_SUTUNLARI)
+    df['Tarih'] = pd.to_datetime(df['Tarih'], format=CSV_TARIH_FORMATI, errors='coerce')
+    for sutun in KAYIT_SUTUNLARI[1:]:
+        if sutun in METIN_SUTUNLARI:
+            continue
+        if not pd.api.types.is_numeric_dtype(df[sutun]):
+            df[sutun] = pd.to_numeric(df[sutun], errors='coerce')
+    for sutun, etiketler in KATEGORILER.items():
+        # Eşleme sadece farklı değerler üzerinden yapılır
+        anahtarlar = _KATEGORI_ANAHTARLARI[sutun]
+        farkli = df[sutun].dropna().unique()
+        esleme = {d: anahtarlar.get(_sadelestir(d)) for d in farkli}
+        df[sutun] = pd.Categorical(df[sutun].map(esleme), categories=etiketler)
+    df['Hasta'] = df['Hasta'].astype('category')
+    return df
+
+
+def _dosya_oku(dosya):
+    try:
+        return dosya, dosya.read_bytes(), None
+    except OSError as e:
+        return dosya, None, e
+
+
+def _tek_tek_ayristir(okunanlar):
+    """Birleştirilemeyen dosyalar (boş satır, tırnaklı alan vb.) ayrı ayrı okunur."""
+    parcalar = []
+    for dosya, veri in okunanlar:
+        try:
+            df = pd.read_csv(io.BytesIO(veri), dtype={s: str for s in METIN_SUTUNLARI})
+        except Exception as e:
+            print(f"Okuma hatası ({dosya.name}): {e}", file=sys.stderr)
+            continue
+        parcalar.append(df.assign(Hasta=dosya.stem))
+    return parcalar
+
+
+def _parca_ayristir(okunanlar):
+    """Okunan (dosya, bayt) çiftlerini tek tabloya ayrıştırır."""
+    # Başlık -> (dosyalar, hasta adları, satır sayıları, gövdeler)
+    gruplar = {}
+    ayri = []
+    for dosya, veri in okunanlar:
+        baslik, _, govde = veri.partition(b'\n')
+        govde = govde.rstrip(b'\r\n')
+        if not govde:
+            continue  # Boş dosya ya da sadece başlık
+        if b'"' in govde or b'\n\n' in govde or b'\n\r\n' in govde:
+            # Satır sayısı satır sonlarından çıkarılamaz (tırnaklı alan, boş satır)
+            ayri.append((dosya, veri))
+            continue
+        grup = gruplar.setdefault(baslik.rstrip(b'\r'), ([], [], [], []))
+        grup[0].append((dosya, veri))
+        grup[1].append(dosya.stem)
+        grup[2].append(govde.count(b'\n') + 1)
+        grup[3].append(govde + b'\n')
+
+    parcalar = _tek_tek_ayristir(ayri)
+    for baslik, (dosyalar, hastalar, satirlar, govdeler) in gruplar.items():
+        try:
+            df = pd.read_csv(io.BytesIO(baslik + b'\n' + b''.join(govdeler)),
+                             dtype={s: str for s in METIN_SUTUNLARI})
+        except Exception:
+            df = None
+        if df is None or len(df) != sum(satirlar):
+            # Satırlar hastalara güvenle dağıtılamıyor: bu grup dosya dosya okunur
+            parcalar.extend(_tek_tek_ayristir(dosyalar))
+            continue
+        df['Hasta'] = np.repeat(np.array(hastalar, dtype=object), satirlar)
+        parcalar.append(df)
+
+    if not parcalar:
+        return pd.DataFrame(columns=KOHORT_SUTUNLARI)
+    return pd.concat(parcalar, ignore_index=True) if len(parcalar) > 1 else parcalar[0]
+
+
+def kohort_akisi(klasor, parca_dosya=PARCA_DOSYA, is_parcacigi=None):
+    """Klasördeki kayıtları ``parca_dosya`` dosyalık normalleştirilmiş tablolar halinde üretir.
+
+    Bir parça ayrıştırılırken sonraki parçanın dosyaları okunmaya devam eder;
+    bellekte en fazla iki parçalık ham veri tutulur.
+    """
+    dosyalar = dosyalari_bul(klasor)
+    is_parcacigi = is_parcacigi or min(32, (os.cpu_count() or 1) + 4)
+    with ThreadPoolExecutor(max_workers=is_parcacigi) as havuz:
+        bekleyen = deque()
+        sira = iter(dosyalar)
+        for dosya in sira:
+            bekleyen.append(havuz.submit(_dosya_oku, dosya))
+            if len(bekleyen) >= 2 * parca_dosya:
+                break
+
+        while bekleyen:
+            okunanlar = []
+            while bekleyen and len(okunanlar) < parca_dosya:
+                dosya, veri, hata = bekleyen.popleft().result()
+                if hata is not None:
+                    print(f"Okuma hatası ({dosya.name}): {hata}", file=sys.stderr)
+                else:
+                    okunanlar.append((dosya, veri))
+                sonraki = next(sira, None)
+                if sonraki is not None:
+                    bekleyen.append(havuz.submit(_dosya_oku, sonraki))
+            parca = _parca_ayristir(okunanlar)
+            if len(parca):
+                yield normallestir(parca)
+
+
+@izle('kohort_oku')
+def kohort_oku(klasor, parca_dosya=PARCA_DOSYA, is_parcacigi=None):
+    """Tüm hastaların kayıtlarını tek bir normalleştirilmiş tabloda döner."""
+    parcalar = list(kohort_akisi(klasor, parca_dosya, is_parcacigi))
+    if not parcalar:
+        return normallestir(pd.DataFrame(columns=KOHORT_SUTUNLARI))
+    df = pd.concat(parcalar, ignore_index=True)
+    # Parçaların Hasta kategorileri farklı olduğundan birleşimde metne döner
+    df['Hasta'] = df['Hasta'].astype('category')
+    return df
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Hasta kayıt klasörünü tek bir kohort tablosunda birleştirir.")
+    parser.add_argument('klasor', help="Hasta kayıt klasörü (dosya adı = hasta adı)")
+    parser.add_argument('-o', '--cikti', help="Çıktı dosyası (.csv ya da .parquet); verilmezse sadece özet yazılır")
+    parser.add_argument('--parca', type=int, default=PARCA_DOSYA, help="Parça başına dosya sayısı")
+    parser.add_argument('--is-parcacigi', type=int, help="Dosya okuyan iş parçacığı sayısı")
+    args = parser.parse_args(argv)
+
+    bas = time.perf_counter()
+    df = kohort_oku(args.klasor, args.parca, args.is_parcacigi)
+    sure = time.perf_counter() - bas
+    print(f"✅ {df['Hasta'].nunique()} hasta, {len(df)} kayıt okundu ({sure:.2f} sn).", file=sys.stderr)
+    if len(df):
+        print(f"ℹ️ Tarih aralığı: {df['Tarih'].min()} - {df['Tarih'].max()}", file=sys.stderr)
+        for sutun in KATEGORILER:
+            eksik = int(df[sutun].isna().sum())
+            if eksik:
+                print(f"⚠️ {sutun}: {eksik} kayıtta tanınmayan ya da boş değer", file=sys.stderr)
+
+    if args.cikti:
+        try:
+            if args.cikti.lower().endswith('.parquet'):
+                df.to_parquet(args.cikti, index=False)
+            else:
+                df.to_csv(args.cikti, index=False, date_format=CSV_TARIH_FORMATI)
+        except Exception as e:
+            print(f"Hata: {e}", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,191 @@
+"""Tkinter'dan bağımsız PDF rapor motoru.
+
+Bir analiz sonuç kaydından (arayüzdeki ``son_analiz_sonuclari`` ile aynı düzen)
+dört bölümlü sağlık raporunu üretir. Arayüz ve toplu rapor sürücüsü aynı
+fonksiyonu kullanır.
+"""
+import io
+from datetime import datetime
+
+from reportlab.pdfgen import canvas
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.utils import ImageReader
+
+from modules.izleme import izle
+
+# Standart PDF fontları Türkçe karakterleri ve emojileri basamaz
+TR_HARF = {
+    'ı': 'i', 'İ': 'I', 'ş': 's', 'Ş': 'S', 'ğ': 'g', 'Ğ': 'G',
+    'ü': 'u', 'Ü': 'U', 'ö': 'o', 'Ö': 'O', 'ç': 'c', 'Ç': 'C'
+}
+EMOJILER = ['🛡️', '🩸', '❤️', '⚠️', '🔴', '🟠', '✅', '🍔', '🏃', 'g😴', '😴', '💤', '🍷', '🚬', '💡', '■']
+
+
+def metin_temizle(text):
+    """Türkçe karakterleri İngilizceye çevirir ve emojileri temizler."""
+    if not isinstance(text, str):
+        return str(text)
+
+    # 1. Türkçe Karakter Dönüşümü
+    for tr, en in TR_HARF.items():
+        text = text.replace(tr, en)
+
+    # 2. Emojileri Temizle
+    for emoji in EMOJILER:
+        text = text.replace(emoji, "")
+
+    return text.strip()
+
+
+def rapor_dosya_adi(hasta):
+    # Dosya ismindeki Türkçe karakterleri de temizle
+    return f"Rapor_{metin_temizle(hasta).replace(' ', '_')}.pdf"
+
+
+@izle('rapor_yaz')
+def rapor_yaz(data, hedef, hasta, tarih=None, grafik=None):
+    """Sonuç kaydını ``hedef`` dosya yoluna ya da açık bir dosya nesnesine PDF olarak yazar.
+
+    ``data`` anahtarları: vals, bmi, msg ve isteğe bağlı smoking (0/1/2).
+    ``grafik`` verilirse (GrafikOlusturucu.bayt ile PNG baytı ya da .resim ile
+    PIL görüntüsü) ikinci sayfaya eklenir.
+    """
+    vals = data['vals']
+    tarih = tarih or datetime.now()
+
+    c = canvas.Canvas(hedef if hasattr(hedef, 'write') else str(hedef), pagesize=A4)
+    width, height = A4
+
+    # --- BAŞLIK ---
+    c.setFont("Helvetica-Bold", 18)
+    c.drawCentredString(width/2, 800, "SAGLIK RISK ANALIZI VE ONERI RAPORU")
+
+    c.setFont("Helvetica", 10)
+    c.drawCentredString(width/2, 780, f"Rapor Tarihi: {tarih.strftime('%d/%m/%Y %H:%M')}")
+    # İsim kısmını temizle
+    c.drawCentredString(width/2, 765, f"Danisan: {metin_temizle(hasta).replace('_', ' ')}")
+
+    c.line(50, 750, 550, 750) # Çizgi
+
+    # --- 1. GİRİLEN KLİNİK DEĞERLER ---
+    y = 720
+    c.setFont("Helvetica-Bold", 12)
+    c.drawString(50, y, "1. KLINIK DEGERLERINIZ")
+    y -= 25
+
+    c.setFont("Helvetica", 10)
+    # Değerleri yazdırırken metin temizlemeye gerek yok çünkü zaten sayısal veya ingilizce formatta
+    # Ancak label kısımlarını garanti olsun diye ingilizce karakter kullanıyoruz
+    c.drawString(50, y, f"Yas: {int(vals['age'])}")
+    c.drawString(50, y-15, f"BMI (Kilo Indeksi): {data['bmi']:.1f}")
+    c.drawString(50, y-30, f"Tansiyon: {int(vals['sysBP'])}/{int(vals['diaBP'])} mmHg")
+    c.drawString(50, y-45, f"Nabiz: {int(vals['heartRate'])} bpm")
+
+    c.drawString(220, y, f"Aclik Sekeri: {int(vals['glucose'])} mg/dL")
+    c.drawString(220, y-15, f"T. Kolesterol: {int(vals['totChol'])} mg/dL")
+    c.drawString(220, y-30, f"LDL / HDL: {int(vals['LDL'])} / {int(vals['HDL'])}(mg/dL)")
+    c.drawString(220, y-45, f"Trigliserit: {int(vals['triglycerides'])} mg/dL")
+
+    c.drawString(400, y, f"Tuz Tuketimi: {vals['salt']:.1f} g/gun")
+    c.drawString(400, y-15, f"Uyku Suresi: {vals['sleep']} saat")
+    c.drawString(400, y-30, f"Aktivite: {int(vals['activity_min'])} dk/gun")
+
+    y -= 70
+    c.line(50, y, 550, y)
+
+    # --- 2. ANALİZ SONUCU VE RİSK DURUMU ---
+    y -= 30
+    c.setFont("Helvetica-Bold", 12)
+    c.drawString(50, y, "2. ANALIZ SONUCU")
+    y -= 25
+
+    # data['msg'] içindeki emojileri silip Türkçe karakterleri düzelt
+    clean_msg = metin_temizle(data['msg'])
+
+    c.setFont("Helvetica", 11)
+    for line in clean_msg.split('\n'):
+        # Renklendirme mantığı (RISK kelimesini temizledikten sonra kontrol et)
+        if "RISK" in line or "RISKI" in line: c.setFillColorRGB(0.8, 0, 0)
+        else: c.setFillColorRGB(0, 0, 0)
+
+        c.drawString(50, y, line)
+        y -= 15
+
+    y -= 20
+    c.setFillColorRGB(0, 0, 0)
+    c.line(50, y, 550, y)
+
+    # --- 3. KAPSAMLI ÖZET ---
+    y -= 30
+    c.setFont("Helvetica-Bold", 12)
+    c.drawString(50, y, "3. KAPSAMLI RISK DEGERLENDIRMESI")
+    y -= 20
+
+    c.setFont("Helvetica", 10)
+    ozet_metni = []
+
+    if vals['sysBP'] > 130 or vals['diaBP'] > 85:
+        ozet_metni.append("- Tansiyon degerleriniz ideal sinirin uzerinde.")
+    if vals['glucose'] > 100:
+        ozet_metni.append("- Kan sekeri seviyeniz prediyabet veya diyabet sinirlarinda.")
+    if data['bmi'] > 25:
+        ozet_metni.append("- Kilo indeksiniz normalin uzerinde.")
+    if vals['LDL'] > 130 or vals['triglycerides'] > 150:
+        ozet_metni.append("- Kan yaglariniz (Kolesterol/Trigliserit) yuksek.")
+
+    if not ozet_metni:
+        ozet_metni.append("- Genel klinik tablonuz saglikli gorunuyor.")
+    else:
+        ozet_metni.append("- Yukaridaki risk faktorleri metabolik sendrom riski olusturabilir.")
+
+    for madde in ozet_metni:
+        c.drawString(50, y, metin_temizle(madde))
+        y -= 15
+
+    y -= 20
+    c.line(50, y, 550, y)
+
+    # --- 4. YASAM TARZI NOTLARI ---
+    y -= 30
+    c.setFont("Helvetica-Bold", 12)
+    c.drawString(50, y, "4. YASAM TARZI VE ONERILER")
+    y -= 20
+
+    c.setFont("Helvetica", 10)
+    oneri_metni = []
+
+    if vals['salt'] > 5:
+        oneri_metni.append("* Tuz kullanimini azaltin (Gunde 1 tatli kasigini gecmemeli).")
+    if vals['sleep'] < 7:
+        oneri_metni.append("* Uyku duzeninizi iyilestirin.")
+    if vals['activity_min'] < 30:
+        oneri_metni.append("* Fiziksel aktiviteniz yetersiz. Haftada en az 150 dk yuruyus yapin.")
+    if data.get('smoking', 0) == 2:
+        oneri_metni.append("* Sigara kullanimini birakmak icin destek alin.")
+    if vals['sysBP'] > 120:
+        oneri_metni.append("* DASH diyeti tansiyonu dengelemeye yardimci olur.")
+
+    if not oneri_metni:
+        oneri_metni.append("* Yasam tarzi aliskanliklariniz gayet iyi.")
+
+    for oneri in oneri_metni:
+        c.drawString(50, y, metin_temizle(oneri))
+        y -= 15
+
+    # --- DİPNOT ---
+    c.setFont("Helvetica-Oblique", 8)
+    c.drawCentredString(width/2, 50, "Bu rapor yapay zeka destekli bir analizdir. Kesin tani icin doktorunuza basvurunuz.")
+
+    # --- 5. GRAFİKLER (Ayrı sayfa) ---
+    if grafik is not None:
+        c.showPage()
+        c.setFont("Helvetica-Bold", 12)
+        c.drawString(50, 800, "5. GORSEL ANALIZ")
+        resim = ImageReader(io.BytesIO(grafik) if isinstance(grafik, bytes) else grafik)
+        en, boy = resim.getSize()
+        # Sayfa genişliğine sığdır, oranı koru
+        cizim_en = 500
+        cizim_boy = cizim_en * boy / en
+        c.drawImage(resim, 50, 780 - cizim_boy, width=cizim_en, height=cizim_boy)
+
+    c.save()
@@ -0,0 +1,268 @@
+"""Performans ölçüm aracı.
+
+hypertension_data.csv düzeninde sentetik veri üretir, eğitim, tekil tahmin,
+etki analizi, benzer kişi araması, toplu skorlama ve grafik çizimini ölçer.
+Her aşama için gecikme yüzdelikleri, verim ve en yüksek bellek raporlanır;
+sonuçlar sürümler arası karşılaştırma için JSON olarak yazılabilir.
+
+    python -m modules.performans_olcumu --satir 10000 1000000 --json olcum.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from modules.grafik_cizim import GrafikOlusturucu
+from modules.veri_isleme import VeriIsleyici
+
+# Sentetik veri bu kadar satırlık parçalarla yazılır (10M satırda bellek sınırlı kalsın)
+URETIM_PARCASI = 500_000
+
+
+# ---------------------------------------------------------
+# SENTETİK VERİ
+# ---------------------------------------------------------
+def _sentetik_parca(n, rng):
+    yas = rng.integers(18, 90, n)
+    bmi = rng.normal(27, 4.5, n).round(1)
+    sys_bp = (rng.normal(118, 14, n) + 0.45 * (yas - 50) + 0.8 * (bmi - 27)).round()
+    dia_bp = (0.5 * sys_bp + rng.normal(20, 7, n)).round()
+    seker = (rng.normal(98, 18, n) + 1.5 * (bmi - 27) + 0.25 * (yas - 50)).round()
+    tuz = rng.gamma(6, 1.5, n).round(1)
+    sigara = rng.choice(['Never', 'Former', 'Current'], n, p=[0.6, 0.2, 0.2])
+    aile = rng.choice(['Yes', 'No'], n, p=[0.35, 0.65])
+
+    # Hedefler, gerçek veri setindeki gibi risk faktörleriyle ilişkili üretilir
+    z_htn = 0.08 * (sys_bp - 135) + 0.04 * (yas - 50) + 0.15 * (tuz - 9) + 0.8 * (aile == 'Yes')
+    z_dm = 0.06 * (seker - 115) + 0.08 * (bmi - 28) + 0.5 * (aile == 'Yes')
+    htn = np.where(rng.random(n) < 1 / (1 + np.exp(-z_htn)), 'Yes', 'No')
+    dm = np.where(rng.random(n) < 1 / (1 + np.exp(-z_dm)), 'Yes', 'No')
+
+    df = pd.DataFrame({
+        'Age': yas,
+        'Gender': rng.choice(['Male', 'Female'], n),
+        'BMI': bmi,
+        'Systolic_BP': sys_bp,
+        'Diastolic_BP': dia_bp,
+        'Cholesterol': rng.normal(200, 35, n).round(),
+        'LDL': rng.normal(120, 28, n).round(),
+        'HDL': rng.normal(52, 12, n).round(),
+        'Triglycerides': rng.normal(150, 45, n).round(),
+        'Glucose': seker,
+        'Heart_Rate': rng.normal(74, 10, n).round(),
+        'Salt_Intake': tuz,
+        'Alcohol_Intake': rng.gamma(1.5, 3, n).round(1),
+        'Sleep_Duration': rng.normal(7, 1.1, n).round(1),
+        'Physical_Activity_Level': rng.choice(['Low', 'Moderate', 'High'], n),
+        'Smoking_Status': sigara,
+        'Family_History': aile,
+        'Hypertension': htn,
+        'Diabetes': dm,
+    })
+    # Gerçek veride olduğu gibi az sayıda eksik değer
+    df.loc[rng.random(n) < 0.01, 'BMI'] = np.nan
+    df.loc[rng.random(n) < 0.01, 'Cholesterol'] = np.nan
+    return df
+
+
+def sentetik_veri_uret(n, yol, tohum=0):
+    """hypertension_data.csv düzeninde ``n`` satırlık CSV yazar."""
+    rng = np.random.default_rng(tohum)
+    with open(yol, 'w', newline='', encoding='utf-8') as f:
+        for bas in range(0, n, URETIM_PARCASI):
+            _sentetik_parca(min(URETIM_PARCASI, n - bas), rng).to_csv(f, index=False, header=(bas == 0))
+    return yol
+
+
+# ---------------------------------------------------------
+# ÖLÇÜM
+# ---------------------------------------------------------
+def _ozet(sureler, birim_sayisi=1):
+    s = np.asarray(sureler, dtype=np.float64)
+    toplam = float(s.sum())
+    return {
+        'tekrar': len(s),
+        'ort_ms': float(s.mean() * 1e3),
+        'p50_ms': float(np.percentile(s, 50) * 1e3),
+        'p90_ms': float(np.percentile(s, 90) * 1e3),
+        'p99_ms': float(np.percentile(s, 99) * 1e3),
+        'maks_ms': float(s.max() * 1e3),
+        # Verim: saniyede işlenen birim (çağrı ya da satır)
+        'verim_sn': (len(s) * birim_sayisi / toplam) if toplam > 0 else None,
+    }
+
+
+def olc(islev, girdiler, birim_sayisi=1):
+    """İşlevi her girdiyle çağırır; zamanlamayı ve ayrı bir turda en yüksek belleği ölçer.
+
+    tracemalloc zamanlamayı yavaşlattığı için bellek sadece ilk girdiyle ölçülür.
+    """
+    sureler = []
+    for g in girdiler:
+        t = time.perf_counter()
+        islev(g)
+        sureler.append(time.perf_counter() - t)
+
+    tracemalloc.start()
+    try:
+        islev(girdiler[0])
+        _, tepe = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    sonuc = _ozet(sureler, birim_sayisi)
+    sonuc['tepe_bellek_mb'] = tepe / 1e6
+    return sonuc
+
+
+def _sessiz():
+    # Eğitim mesajları ölçüm tablosunu bozmasın
+    return contextlib.redirect_stdout(io.StringIO())
+
+
+def _hastalar(vi, adet, rng):
+    """Referans veriden rastgele hastalar (tahmin girdisi sözlükleri)."""
+    secim = rng.choice(len(vi.df), size=adet, replace=len(vi.df) < adet)
+    return vi.df[vi.features].iloc[secim].to_dict('records')
+
+
+def _gecmis(n, rng):
+    tarih = pd.date_range('2020-01-01', periods=n, freq='6h')
+    sys_bp = 130 + 10 * np.sin(np.arange(n) / 60) + rng.normal(0, 6, n)
+    return pd.DataFrame({'Tarih': tarih, 'SysBP': sys_bp, 'DiaBP': sys_bp * 0.62, 'Risk_Skoru': rng.uniform(10, 70, n)})
+
+
+def asamalari_olc(veri_yolu, satir, tekrar, parca_boyutu=None, tohum=0):
+    rng = np.random.default_rng(tohum)
+    sonuc = {}
+    egitim_tekrar = 3 if satir <= 200_000 else 1
+
+    # --- EĞİTİM ---
+    def egit_soguk(_):
+        with _sessiz():
+            VeriIsleyici(veri_yolu, onbellek=False, parca_boyutu=parca_boyutu)
+    sonuc['egit'] = olc(egit_soguk, [None] * egitim_tekrar, birim_sayisi=satir)
+
+    with _sessiz():
+        VeriIsleyici(veri_yolu, parca_boyutu=parca_boyutu).egit(zorla=True)  # önbelleği yaz
+
+    def egit_onbellek(_):
+        with _sessiz():
+            VeriIsleyici(veri_yolu)
+    sonuc['egit_onbellekten'] = olc(egit_onbellek, [None] * 10)
+
+    # Tahmin önbelleği kapalı: her çağrı gerçekten hesaplanır
+    with _sessiz():
+        vi = VeriIsleyici(veri_yolu, tahmin_onbellek_boyutu=0)
+    hastalar = _hastalar(vi, tekrar, rng)
+
+    # --- TEKİL TAHMİN VE ETKİ ANALİZİ ---
+    sonuc['tahmin_et_htn'] = olc(lambda h: vi.tahmin_et_htn(h, diabetes_status=0), hastalar)
+    sonuc['tahmin_et_dm'] = olc(lambda h: vi.tahmin_et_dm(h, htn_status=0), hastalar)
+    sonuc['get_etki_analizi'] = olc(lambda h: vi.get_etki_analizi(h, target='htn', existing_condition=0), hastalar)
+    sonuc['acikla'] = olc(lambda h: vi.acikla(h), hastalar)
+    sonuc['get_benzer_kisiler'] = olc(
+        lambda h: vi.get_benzer_kisiler(age=h['Age'], gender=h['Gender_Male'], limit=500), hastalar)
+
+    # --- TOPLU SKORLAMA ---
+    toplu = vi.df[vi.features].iloc[rng.choice(len(vi.df), size=100_000)]
+    sonuc['tahmin_et_batch'] = olc(lambda X: vi.tahmin_et_batch(X), [toplu] * 5, birim_sayisi=len(toplu))
+
+    # --- GRAFİKLER (Agg; GrafikCizici ile aynı çizim kodu) ---
+    grafik = GrafikOlusturucu()
+    grafik_tekrar = max(3, min(tekrar // 20, 30))
+    ornekler = hastalar[:grafik_tekrar]
+    benzer = [vi.get_benzer_kisiler(age=h['Age'], gender=h['Gender_Male']) for h in ornekler]
+    etki = [vi.acikla(h) for h in ornekler]
+
+    def ciz(cizici):
+        def calis(i):
+            cizici(i)
+            grafik.fig.canvas.draw()
+        return calis
+
+    sonuc['ciz_tekil_risk_analizi'] = olc(ciz(lambda i: grafik.ciz_tekil_risk_analizi(
+        benzer[i], ornekler[i]['Age'], ornekler[i]['Glucose'], etki[i]['dm']['risk'],
+        etki[i]['dm']['etkiler'], mod="dm")), list(range(grafik_tekrar)))
+    sonuc['ciz_ikili_risk_dashboard'] = olc(ciz(lambda i: grafik.ciz_ikili_risk_dashboard(
+        benzer[i], ornekler[i]['Age'], ornekler[i]['Systolic_BP'], ornekler[i]['Glucose'],
+        etki[i]['htn']['risk'], etki[i]['dm']['risk'], etki[i]['htn']['etkiler'], etki[i]['dm']['etkiler'])),
+        list(range(grafik_tekrar)))
+    sonuc['ciz_saglik_yonetimi'] = olc(ciz(lambda i: grafik.ciz_saglik_yonetimi(ornekler[i])), list(range(grafik_tekrar)))
+    gecmis = _gecmis(5000, rng)
+    sonuc['ciz_gecmis_trend'] = olc(ciz(lambda i: grafik.ciz_gecmis_trend(gecmis)), list(range(grafik_tekrar)))
+    return sonuc
+
+
+def ortam_bilgisi():
+    import matplotlib
+    import sklearn
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'islemci': platform.processor() or platform.machine(),
+        'cekirdek': os.cpu_count(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'sklearn': sklearn.__version__,
+        'matplotlib': matplotlib.__version__,
+        'zaman': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+
+
+def tabloyu_yaz(satir, sonuc, akis=sys.stdout):
+    print(f"\n=== {satir:,} satır ===", file=akis)
+    print(f"{'Aşama':<26}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'verim/sn':>14}{'bellek MB':>11}", file=akis)
+    for ad, o in sonuc.items():
+        verim = f"{o['verim_sn']:,.0f}" if o['verim_sn'] else '-'
+        print(f"{ad:<26}{o['p50_ms']:>10.3f}{o['p90_ms']:>10.3f}{o['p99_ms']:>10.3f}{verim:>14}{o['tepe_bellek_mb']:>11.1f}",
+              file=akis)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Eğitim, tahmin, kohort ve grafik aşamalarının performansını ölçer.")
+    parser.add_argument('--satir', type=int, nargs='+', default=[10_000, 100_000],
+                        help="Sentetik veri boyutları (ör. 10000 1000000 10000000)")
+    parser.add_argument('--tekrar', type=int, default=1000, help="Tekil çağrı aşamalarında tekrar sayısı")
+    parser.add_argument('--parca', type=int, help="Eğitimi bu parça boyutuyla akışta yap (büyük veri için)")
+    parser.add_argument('--klasor', help="Sentetik verinin tutulacağı klasör (verilirse tekrar kullanılır)")
+    parser.add_argument('--json', help="Sonuçların yazılacağı JSON dosyası")
+    parser.add_argument('--tohum', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rapor = {'ortam': ortam_bilgisi(), 'ayarlar': vars(args), 'olcumler': {}}
+    with contextlib.ExitStack() as yigin:
+        klasor = args.klasor or yigin.enter_context(tempfile.TemporaryDirectory())
+        os.makedirs(klasor, exist_ok=True)
+        for satir in args.satir:
+            # Her boyut ayrı klasörde: model önbelleği ve referans dosyası birbirine karışmasın
+            alt = os.path.join(klasor, f"veri_{satir}")
+            os.makedirs(alt, exist_ok=True)
+            yol = os.path.join(alt, 'hypertension_data.csv')
+            if not os.path.exists(yol):
+                t = time.perf_counter()
+                sentetik_veri_uret(satir, yol, args.tohum)
+                print(f"ℹ️ {satir:,} satır üretildi ({time.perf_counter() - t:.1f} sn)", file=sys.stderr)
+
+            sonuc = asamalari_olc(yol, satir, args.tekrar, args.parca, args.tohum)
+            rapor['olcumler'][str(satir)] = sonuc
+            tabloyu_yaz(satir, sonuc)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(rapor, f, ensure_ascii=False, indent=2)
+        print(f"\n✅ Sonuçlar yazıldı: {args.json}", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
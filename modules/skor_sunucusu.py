@@ -0,0 +1,373 @@
+"""Yerel JSON skorlama sunucusu.
+
+Modeller ana süreçte bir kez yüklenir, ardından dinleyen soket açılıp ``--isci``
+kadar alt süreç çatallanır (fork). Model ağırlıkları yazma anında kopyalanan
+bellekte, referans veri mmap ile paylaşılır; yeni süreç modeli yeniden okumaz.
+Her işçide eşzamanlı istekler kısa bir bekleme penceresinde toplanıp tek bir
+vektörel skorlamada (toplu_skor.parcayi_skorla) işlenir.
+
+    python -m modules.skor_sunucusu --port 8765 --isci 4
+    python -m modules.skor_sunucusu --soket /tmp/saglik_skor.sock
+
+Uç noktalar (girdi kayıt düzenindedir: Yas, SysBP, Seker, Sigara, Hipertansiyon ...):
+
+    GET  /saglik   -> {"durum": "hazir", "pid": ...}
+    POST /skor     -> tek kayıt: {"Yas": 54, ...}            -> {"senaryo": 3, "risk_htn": ...}
+                      toplu:     {"kayitlar": [...], "etkiler": true} -> {"sonuclar": [...]}
+
+Kayıtta toplu_skor.ZORUNLU_SUTUNLAR alanlarından biri yoksa, boşsa ya da
+geçersizse istek 400 ile reddedilir; eksik değerler tahminle doldurulmaz.
+"""
+import argparse
+import contextlib
+import json
+import os
+import queue
+import signal
+import socket
+import socketserver
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+
+from modules.izleme import aralik
+from modules.toplu_skor import kayitlari_donustur, parcayi_skorla, _evet_mi
+from modules.veri_isleme import VeriIsleyici
+
+# Bir toplu skorlamaya alınacak en fazla satır ve ilk istekten sonra beklenecek süre
+TOPLU_BOYUT = 256
+BEKLEME_MS = 2
+# İstek gövdesi sınırı (bayt)
+MAKS_GOVDE = 10 * 1024 * 1024
+# Katkı sözlüğüne alınmayacak kadar küçük etkiler
+ETKI_ESIGI = 0.001
+
+SONUC_SUTUNLARI = {
+    'Senaryo': 'senaryo', 'Senaryo_Aciklama': 'senaryo_aciklama',
+    'Risk_HTN': 'risk_htn', 'Risk_DM': 'risk_dm', 'Risk_Skoru': 'risk_skoru',
+}
+
+
+class IstekHatasi(ValueError):
+    """Girdi kaynaklı hata; istemciye 400 olarak döner."""
+
+
+# ---------------------------------------------------------
+# SKORLAMA
+# ---------------------------------------------------------
+def _etkiler(veri_isleyici, df):
+    """Her satır için henüz olmayan hastalıkların özellik katkıları (ham özellik adlarıyla)."""
+    X = kayitlari_donustur(df)
+    has_htn = _evet_mi(df['Hipertansiyon']) if 'Hipertansiyon' in df.columns else [False] * len(df)
+    has_dm = _evet_mi(df['Diyabet']) if 'Diyabet' in df.columns else [False] * len(df)
+    htn = veri_isleyici.get_etki_analizi_batch(X, 'htn', existing_condition=has_dm).to_dict('records')
+    dm = veri_isleyici.get_etki_analizi_batch(X, 'dm', existing_condition=has_htn).to_dict('records')
+
+    sonuc = []
+    for i in range(len(df)):
+        satir = {}
+        # analiz_yap gibi: mevcut hastalık için risk ve katkı hesaplanmaz
+        if not has_htn[i]:
+            satir['htn'] = {ad: d for ad, d in htn[i].items() if abs(d) > ETKI_ESIGI}
+        if not has_dm[i]:
+            satir['dm'] = {ad: d for ad, d in dm[i].items() if abs(d) > ETKI_ESIGI}
+        sonuc.append(satir)
+    return sonuc
+
+
+def kayitlari_skorla(veri_isleyici, kayitlar, etkiler=False):
+    """Kayıt sözlüklerini skorlar; her kayıt için senaryo, riskler ve isteğe bağlı katkılar döner."""
+    if not kayitlar:
+        return []
+    try:
+        df = pd.DataFrame.from_records(kayitlar)
+        skorlar = parcayi_skorla(veri_isleyici, df)
+    except (KeyError, TypeError, ValueError, ArithmeticError) as e:
+        # ArithmeticError: 10**400 gibi float'a sığmayan sayılar (OverflowError)
+        raise IstekHatasi(f"Geçersiz kayıt: {e}") from e
+
+    # Toplu dosyalardan farklı olarak eksik alanlar ortalamayla doldurulmaz: istemci düzeltmeli
+    eksik = skorlar['Eksik_Alanlar'].to_numpy()
+    hatali = [i for i, alanlar in enumerate(eksik) if alanlar]
+    if hatali:
+        if len(kayitlar) == 1:
+            raise IstekHatasi(f"Eksik ya da geçersiz alanlar: {eksik[0]}")
+        raise IstekHatasi("Eksik ya da geçersiz alanlar: " +
+                          "; ".join(f"kayıt {i + 1}: {eksik[i]}" for i in hatali))
+
+    sonuc = [
+        {hedef: satir[kaynak] for kaynak, hedef in SONUC_SUTUNLARI.items()}
+        for satir in skorlar[list(SONUC_SUTUNLARI)].to_dict('records')
+    ]
+    if etkiler is True:
+        etkiler = [True] * len(kayitlar)
+    if etkiler:
+        secili = [i for i, e in enumerate(etkiler) if e]
+        if secili:
+            for i, etki in zip(secili, _etkiler(veri_isleyici, df.iloc[secili].reset_index(drop=True))):
+                sonuc[i]['etkiler'] = etki
+    return sonuc
+
+
+class _Is:
+    __slots__ = ('kayitlar', 'etkiler', 'sonuc', 'hata', 'bitti')
+
+    def __init__(self, kayitlar, etkiler):
+        self.kayitlar = kayitlar
+        self.etkiler = etkiler
+        self.sonuc = None
+        self.hata = None
+        self.bitti = threading.Event()
+
+
+class Toplayici:
+    """Eşzamanlı istekleri tek bir vektörel skorlamada birleştiren kuyruk.
+
+    Yük yokken istek beklemeden işlenir; yük altında ilk isteğin ardından
+    ``bekleme`` süresi boyunca gelenler (en fazla ``toplu_boyut`` satır) eklenir.
+    """
+
+    def __init__(self, veri_isleyici, toplu_boyut=TOPLU_BOYUT, bekleme_ms=BEKLEME_MS):
+        self.veri_isleyici = veri_isleyici
+        self.toplu_boyut = toplu_boyut
+        self.bekleme = bekleme_ms / 1000
+        self.kuyruk = queue.Queue()
+        threading.Thread(target=self._calis, daemon=True).start()
+
+    def skorla(self, kayitlar, etkiler=False):
+        is_ = _Is(kayitlar, etkiler)
+        self.kuyruk.put(is_)
+        is_.bitti.wait()
+        if is_.hata is not None:
+            raise is_.hata
+        return is_.sonuc
+
+    def _calis(self):
+        while True:
+            isler = [self.kuyruk.get()]
+            satir = len(isler[0].kayitlar)
+            # Kuyrukta bekleyen yoksa yük yok demektir: pencere açılmadan hemen işlenir
+            son = time.monotonic() + (0 if self.kuyruk.empty() else self.bekleme)
+            while satir < self.toplu_boyut:
+                kalan = son - time.monotonic()
+                try:
+                    is_ = self.kuyruk.get(timeout=kalan) if kalan > 0 else self.kuyruk.get_nowait()
+                except queue.Empty:
+                    break
+                isler.append(is_)
+                satir += len(is_.kayitlar)
+            self._isle(isler)
+
+    def _isle(self, isler):
+        kayitlar, etkiler = [], []
+        for is_ in isler:
+            kayitlar.extend(is_.kayitlar)
+            etkiler.extend([bool(is_.etkiler)] * len(is_.kayitlar))
+        try:
+            with aralik('sunucu.toplu_skor'):
+                sonuclar = kayitlari_skorla(self.veri_isleyici, kayitlar, etkiler)
+        except Exception:
+            # Hatalı bir kayıt diğer isteklerin sonucunu bozmasın: her istek ayrı denenir
+            for is_ in isler:
+                try:
+                    is_.sonuc = kayitlari_skorla(self.veri_isleyici, is_.kayitlar, is_.etkiler)
+                except Exception as e:
+                    is_.hata = e
+                is_.bitti.set()
+            return
+        bas = 0
+        for is_ in isler:
+            is_.sonuc = sonuclar[bas:bas + len(is_.kayitlar)]
+            bas += len(is_.kayitlar)
+            is_.bitti.set()
+
+
+# ---------------------------------------------------------
+# HTTP
+# ---------------------------------------------------------
+class SkorIstegi(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # Bağlantı tekrar kullanılır (keep-alive)
+    server_version = 'SaglikSkor/1.0'
+
+    def setup(self):
+        # Küçük yanıtlarda Nagle + gecikmeli ACK her isteğe ~40 ms ekler
+        self.disable_nagle_algorithm = self.server.address_family != getattr(socket, 'AF_UNIX', None)
+        super().setup()
+
+    def log_message(self, format, *args):
+        pass  # Saniyede yüzlerce istekte erişim günlüğü tutulmaz
+
+    def _yanit(self, kod, govde):
+        veri = json.dumps(govde, ensure_ascii=False).encode('utf-8')
+        self.send_response(kod)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(veri)))
+        self.end_headers()
+        self.wfile.write(veri)
+
+    def do_GET(self):
+        if self.path != '/saglik':
+            return self._yanit(404, {'hata': 'Bulunamadı'})
+        self._yanit(200, {'durum': 'hazir', 'pid': os.getpid()})
+
+    def do_POST(self):
+        if self.path != '/skor':
+            return self._yanit(404, {'hata': 'Bulunamadı'})
+        try:
+            uzunluk = int(self.headers.get('Content-Length') or 0)
+        except ValueError:
+            uzunluk = -1
+        if uzunluk < 0:
+            # Gövdenin nerede bittiği bilinmiyor; bağlantı tekrar kullanılamaz
+            self.close_connection = True
+            return self._yanit(400, {'hata': 'Geçersiz Content-Length'})
+        if uzunluk > MAKS_GOVDE:
+            self.close_connection = True
+            return self._yanit(413, {'hata': 'İstek çok büyük'})
+        try:
+            govde = json.loads(self.rfile.read(uzunluk) or b'null')
+        except ValueError:
+            return self._yanit(400, {'hata': 'Geçersiz JSON'})
+
+        if isinstance(govde, dict) and isinstance(govde.get('kayitlar'), list):
+            kayitlar, tekil = govde['kayitlar'], False
+            etkiler = bool(govde.get('etkiler'))
+        elif isinstance(govde, dict):
+            etkiler = bool(govde.pop('etkiler', False))
+            kayitlar, tekil = [govde], True
+        else:
+            return self._yanit(400, {'hata': 'Gövde bir kayıt ya da {"kayitlar": [...]} olmalı'})
+        if not all(isinstance(k, dict) for k in kayitlar):
+            return self._yanit(400, {'hata': 'Her kayıt bir JSON nesnesi olmalı'})
+
+        try:
+            sonuclar = self.server.toplayici.skorla(kayitlar, etkiler)
+        except IstekHatasi as e:
+            return self._yanit(400, {'hata': str(e)})
+        except Exception as e:
+            print(f"Hata: {e}", file=sys.stderr)
+            return self._yanit(500, {'hata': 'Skorlama başarısız'})
+        self._yanit(200, sonuclar[0] if tekil else {'sonuclar': sonuclar})
+
+
+class _TcpSunucu(ThreadingHTTPServer):
+    allow_reuse_address = True
+    request_queue_size = 1024  # Varsayılan 5; yoğun girişte bağlantılar reddedilmesin
+
+
+class _UnixSunucu(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def get_request(self):
+        istek, _ = super().get_request()
+        # BaseHTTPRequestHandler istemci adresini (host, port) çifti olarak bekler
+        return istek, ('unix', 0)
+
+
+def sunucu_kur(host='127.0.0.1', port=8765, soket=None):
+    """Dinleyen sunucuyu kurar (işçiler çatallanmadan önce, ana süreçte)."""
+    if soket:
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(soket)
+        return _UnixSunucu(soket, SkorIstegi)
+    return _TcpSunucu((host, port), SkorIstegi)
+
+
+def _isci_calistir(sunucu, veri_isleyici, toplu_boyut, bekleme_ms):
+    sunucu.toplayici = Toplayici(veri_isleyici, toplu_boyut, bekleme_ms)
+    try:
+        sunucu.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+def _isci_baslat(sunucu, veri_isleyici, toplu_boyut, bekleme_ms):
+    pid = os.fork()
+    if pid:
+        return pid
+    # Alt süreç: ana sürecin sinyal işleyicileri ve çıkış kancaları devralınmaz
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    kod = 0
+    try:
+        _isci_calistir(sunucu, veri_isleyici, toplu_boyut, bekleme_ms)
+    except Exception as e:
+        print(f"Hata (işçi {os.getpid()}): {e}", file=sys.stderr)
+        kod = 1
+    finally:
+        os._exit(kod)
+
+
+def calistir(sunucu, veri_isleyici, isci=1, toplu_boyut=TOPLU_BOYUT, bekleme_ms=BEKLEME_MS):
+    """İşçileri çatallar ve ölenleri yeniden başlatır; fork yoksa tek süreçte çalışır."""
+    if isci <= 1 or not hasattr(os, 'fork'):
+        _isci_calistir(sunucu, veri_isleyici, toplu_boyut, bekleme_ms)
+        return
+
+    durduruluyor = False
+
+    def durdur(signum, frame):
+        nonlocal durduruluyor
+        durduruluyor = True
+        for pid in list(isciler):
+            with contextlib.suppress(ProcessLookupError):
+                os.kill(pid, signal.SIGTERM)
+
+    signal.signal(signal.SIGTERM, durdur)
+    signal.signal(signal.SIGINT, durdur)
+    isciler = {_isci_baslat(sunucu, veri_isleyici, toplu_boyut, bekleme_ms) for _ in range(isci)}
+    while isciler:
+        try:
+            pid, durum = os.wait()
+        except ChildProcessError:
+            break
+        isciler.discard(pid)
+        if not durduruluyor:
+            print(f"⚠️ İşçi {pid} durdu (durum {durum}), yeniden başlatılıyor.", file=sys.stderr)
+            time.sleep(1)  # Açılışta çöken işçiler döngüye girmesin
+            isciler.add(_isci_baslat(sunucu, veri_isleyici, toplu_boyut, bekleme_ms))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="HTN / DM risk skorlaması için yerel JSON sunucusu.")
+    parser.add_argument('--host', default='127.0.0.1', help="Dinlenecek adres (varsayılan: sadece yerel)")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--soket', help="TCP yerine bu Unix soket dosyasını dinle")
+    parser.add_argument('--isci', type=int, default=os.cpu_count() or 1, help="Çatallanacak işçi süreç sayısı")
+    parser.add_argument('--veri', help="Eğitim veri seti yolu (varsayılan: data/hypertension_data.csv)")
+    parser.add_argument('--toplu-boyut', type=int, default=TOPLU_BOYUT, help="Bir toplu skorlamadaki en fazla satır")
+    parser.add_argument('--bekleme-ms', type=float, default=BEKLEME_MS,
+                        help="Yük altında istekleri toplamak için beklenecek süre (ms)")
+    args = parser.parse_args(argv)
+
+    with contextlib.redirect_stdout(sys.stderr):
+        veri_isleyici = VeriIsleyici(args.veri)
+    if veri_isleyici.model_htn is None:
+        print("Hata: Modeller hazırlanamadı (veri seti bulunamadı mı?)", file=sys.stderr)
+        return 1
+
+    try:
+        sunucu = sunucu_kur(args.host, args.port, args.soket)
+    except OSError as e:
+        print(f"Hata: {e}", file=sys.stderr)
+        return 1
+    adres = args.soket or f"http://{args.host}:{sunucu.server_address[1]}"
+    print(f"✅ Skor sunucusu hazır: {adres} ({args.isci} işçi)", file=sys.stderr)
+    try:
+        calistir(sunucu, veri_isleyici, args.isci, args.toplu_boyut, args.bekleme_ms)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        sunucu.server_close()
+        if args.soket:
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(args.soket)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,122 @@
+"""Kategorik temizleme eşdeğerlik denetimi.
+
+``VeriIsleyici._veri_temizle`` içindeki vektörel kuralları, yerlerini aldığı
+satır satır ``apply`` lambdalarıyla karışık, eksik ve bool değerli örnek
+sütunlarda karşılaştırır. Değer ya da tip farkı varsa 1 ile çıkar.
+
+    python -m modules.temizleme_denetimi
+"""
+import sys
+
+import numpy as np
+import pandas as pd
+
+from modules.veri_isleme import VeriIsleyici
+
+
+# ---------------------------------------------------------
+# ESKİ KURALLAR (egit() içindeki .apply lambdaları, olduğu gibi)
+# ---------------------------------------------------------
+def _eski_cinsiyet(x):
+    return 1 if 'male' in x.lower() and 'female' not in x.lower() else (1 if x.strip() == '1' else 0)
+
+
+def _eski_sigara(x):
+    s = str(x).lower()
+    if 'current' in s or 'smoker' in s or 'yes' in s: return 2
+    if 'former' in s or 'past' in s: return 1
+    return 0
+
+
+def _eski_evet(x):
+    return 1 if 'yes' in x.lower() or '1' in x or 'true' in x.lower() else 0
+
+
+def _eski_aktivite(x):
+    s = str(x).lower()
+    if 'low' in s: return 1
+    elif 'moderate' in s: return 2
+    elif 'high' in s: return 3
+    return 2
+
+
+def _eski_htn(x):
+    return 1 if 'high' in x.lower() or 'yes' in x.lower() or '1' in x else 0
+
+
+def eski_temizle(df):
+    # pandas < 3'te astype(str) eksik değerleri de 'nan' metnine çeviriyordu; sürümden bağımsız olmak için map(str)
+    df = df.copy()
+    df['Gender_Male'] = df['Gender'].map(str).apply(_eski_cinsiyet)
+    df['Smoking_Num'] = df['Smoking_Status'].apply(_eski_sigara)
+    df['Family_History_Num'] = df['Family_History'].map(str).apply(_eski_evet)
+    df['Physical_Activity_Level'] = df['Physical_Activity_Level'].apply(_eski_aktivite)
+    df['Target_HTN'] = df['Hypertension'].map(str).apply(_eski_htn)
+    df['Target_DM'] = df['Diabetes'].map(str).apply(_eski_evet)
+    return df
+
+
+# ---------------------------------------------------------
+# ÖRNEK GİRDİLER
+# ---------------------------------------------------------
+def ornek_tablolar():
+    """(ad, DataFrame) çiftleri: metin, eksik, sayı ve bool karışımları."""
+    karisik = [True, 1, 1.0, False, 0, '1', 'Yes', ' yes ', None, np.nan, 'True', 'high', 'No', '', 'female', 'Male']
+    n = len(karisik)
+    yield 'karisik', pd.DataFrame({
+        'Gender': karisik,
+        'Smoking_Status': ['Current', 'former', 'Never', None, np.nan, 'smoker', 'PAST', True] * 2,
+        'Family_History': karisik[::-1],
+        'Physical_Activity_Level': ['Low', 'moderate', 'HIGH', None, 'x', np.nan, 3, 'low'] * 2,
+        'Hypertension': karisik,
+        'Diabetes': karisik[::-1],
+        'Systolic_BP': np.full(n, 120.0), 'Glucose': np.full(n, 90.0),
+    })
+    yield 'bool', pd.DataFrame({
+        'Gender': [True, False, True], 'Smoking_Status': [True, False, False],
+        'Family_History': [True, False, True], 'Physical_Activity_Level': [True, False, True],
+        'Hypertension': [True, False, True], 'Diabetes': [False, True, True],
+        'Systolic_BP': [150.0, 120.0, 130.0], 'Glucose': [90.0, 130.0, 100.0],
+    })
+    yield 'sayisal', pd.DataFrame({
+        'Gender': [1, 0, 1.0, np.nan], 'Smoking_Status': [0, 1, 2, np.nan],
+        'Family_History': [1.0, 0.0, np.nan, 11.0], 'Physical_Activity_Level': [1, 2, 3, 4],
+        'Hypertension': [1, 0, 1, 0], 'Diabetes': [0.0, 1.0, np.nan, 1.0],
+        'Systolic_BP': [150.0, 120.0, 130.0, 145.0], 'Glucose': [90.0, 130.0, 100.0, 126.0],
+    })
+
+
+SUTUNLAR = ['Gender_Male', 'Smoking_Num', 'Family_History_Num', 'Physical_Activity_Level', 'Target_HTN', 'Target_DM']
+
+
+def karsilastir(df):
+    """Eski ve yeni temizlemenin farklı olduğu sütunları [(sütun, açıklama)] olarak döner."""
+    # Eğitim yapılmadan sadece temizleme adımı kullanılır
+    yeni = VeriIsleyici.__new__(VeriIsleyici)._veri_temizle(df.copy())
+    eski = eski_temizle(df)
+    farklar = []
+    for col in SUTUNLAR:
+        if yeni[col].dtype != eski[col].dtype:
+            farklar.append((col, f"tip {yeni[col].dtype} != {eski[col].dtype}"))
+        fark = np.flatnonzero(yeni[col].to_numpy() != eski[col].to_numpy())
+        if len(fark):
+            i = fark[0]
+            farklar.append((col, f"{len(fark)} satır farklı, ilk: girdi={df.iloc[i].to_dict()!r} "
+                                 f"yeni={yeni[col].iloc[i]} eski={eski[col].iloc[i]}"))
+    return farklar
+
+
+def main(argv=None):
+    hata = False
+    for ad, df in ornek_tablolar():
+        farklar = karsilastir(df)
+        for col, aciklama in farklar:
+            print(f"🔴 {ad}/{col}: {aciklama}")
+        hata |= bool(farklar)
+        if not farklar:
+            print(f"✅ {ad}: {len(df)} satır, {len(SUTUNLAR)} sütun aynı.")
+    return 1 if hata else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
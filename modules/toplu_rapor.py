@@ -0,0 +1,224 @@
+"""Tüm hastalar için toplu PDF rapor üretimi.
+
+Her hastanın son kaydı tek bir VeriIsleyici ile vektörel olarak skorlanır,
+raporlar ise bir süreç havuzunda paralel yazılır. Girdi ya kayıt klasörüdür
+(dosya adı = hasta adı) ya da ``toplu_skor`` çıktısı gibi skorlanmış bir dosya.
+Grafikler Agg ile bellekte çizilir; ekran ya da geçici dosya gerekmez.
+
+    python -m modules.toplu_rapor hasta_saglik_records -o raporlar
+    python -m modules.toplu_rapor --skorlar skorlar.csv -o raporlar --islem 8
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+
+from modules.grafik_cizim import GrafikOlusturucu
+from modules.kohort_yukleyici import kohort_oku
+from modules.pdf_rapor import rapor_yaz, rapor_dosya_adi
+from modules.toplu_skor import kayitlari_donustur, parcayi_skorla
+from modules.veri_isleme import VeriIsleyici, SIGARA_KODLARI
+
+# Kayıt sütunu -> rapordaki ``vals`` anahtarı
+RAPOR_DEGERLERI = {
+    'Yas': 'age', 'SysBP': 'sysBP', 'DiaBP': 'diaBP', 'Nabiz': 'heartRate',
+    'Seker': 'glucose', 'Kolesterol': 'totChol', 'LDL': 'LDL', 'HDL': 'HDL',
+    'Trigliserit': 'triglycerides', 'Tuz_Gr': 'salt', 'Uyku': 'sleep',
+    'Aktivite': 'activity_min', 'Kilo': 'weight', 'Alkol': 'alcohol', 'BMI': 'BMI',
+}
+
+
+def senaryo_mesaji(senaryo, risk_htn, risk_dm):
+    """analiz_yap'ın sonuç etiketindeki metnin aynısı."""
+    if senaryo == 1:
+        return f"Mevcut Durum: Hipertansiyon Hastası\n🛡️ DİYABET RİSKİ: %{risk_dm:.1f}"
+    if senaryo == 2:
+        return f"Mevcut Durum: Diyabet Hastası\n🛡️ TANSİYON RİSKİ: %{risk_htn:.1f}"
+    if senaryo == 3:
+        return f"❤️ TANSİYON RİSKİ: %{risk_htn:.1f}\n🩸 DİYABET RİSKİ: %{risk_dm:.1f}"
+    return "⚠️ İki kronik rahatsızlık mevcut.\nRisk yerine değerlerinizin ideal aralıklara\nolan uzaklığı analiz edildi."
+
+
+def son_kayitlar(klasor):
+    """Klasördeki her hasta CSV'sinin en son kaydını tek tabloda toplar (``Hasta`` sütunu = dosya adı)."""
+    df = kohort_oku(klasor)
+    if df.empty:
+        return pd.DataFrame()
+    # Aynı dakikadaki kayıtlarda dosyadaki son satır geçerlidir; tarihi okunamayanlar en sona kalmaz
+    df = df.sort_values(['Hasta', 'Tarih'], kind='stable', na_position='first')
+    return df.groupby('Hasta', observed=True).tail(1).reset_index(drop=True)
+
+
+def eksikleri_ayir(skorlar):
+    """Eksik ya da geçersiz alanı olan satırları ayırır; (kalan, [(hasta, hata)]) döner.
+
+    Bu satırların riskleri ortalamayla doldurulmuş değerlerden hesaplandığı için rapor üretilmez.
+    """
+    if 'Eksik_Alanlar' not in skorlar.columns:
+        return skorlar, []
+    eksik = skorlar['Eksik_Alanlar'].fillna("").astype(str).str.strip()
+    hatalar = [(str(hasta), f"Eksik ya da geçersiz alanlar: {alanlar}")
+               for hasta, alanlar in zip(skorlar.loc[eksik != "", 'Hasta'], eksik[eksik != ""])]
+    return skorlar[eksik == ""], hatalar
+
+
+def sonuc_kayitlari(skorlar):
+    """Skorlanmış tabloyu rapor motorunun beklediği sonuç kayıtlarına çevirir."""
+    if 'Hasta' not in skorlar.columns:
+        skorlar = skorlar.assign(Hasta=[f"Hasta_{i + 1}" for i in range(len(skorlar))])
+    ozellikler = kayitlari_donustur(skorlar).to_dict('records')
+    for satir, user_data in zip(skorlar.to_dict('records'), ozellikler):
+        vals = {hedef: satir.get(kaynak) for kaynak, hedef in RAPOR_DEGERLERI.items()}
+        senaryo = int(satir['Senaryo'])
+        yield {
+            'hasta': str(satir['Hasta']),
+            'vals': vals,
+            'user_data': user_data,
+            'bmi': vals['BMI'],
+            'risk_htn': satir['Risk_HTN'],
+            'risk_dm': satir['Risk_DM'],
+            'has_htn': senaryo in (1, 4),
+            'has_dm': senaryo in (2, 4),
+            'smoking': SIGARA_KODLARI.get(str(satir.get('Sigara', '')).strip(), 0),
+            'msg': senaryo_mesaji(senaryo, satir['Risk_HTN'], satir['Risk_DM']),
+        }
+
+
+# Her süreçte bir kez kurulan nesneler: modeller ve grafik tipine göre hazır figürler
+_ISCI = {}
+
+
+def _isci_baslat(veri_yolu, grafikli):
+    """Süreç havuzu başlatıcısı. Modeller önbellekten, referans veri mmap ile açılır."""
+    _ISCI.clear()
+    _ISCI['grafikler'] = {}
+    if grafikli:
+        with contextlib.redirect_stdout(io.StringIO()):
+            _ISCI['vi'] = VeriIsleyici(veri_yolu)
+
+
+def _grafik(kayit):
+    """Arayüzdeki analiz grafiğini ekransız çizip PIL görüntüsü olarak döner."""
+    vi = _ISCI.get('vi')
+    if vi is None or vi.model_htn is None:
+        return None
+    user_data = kayit['user_data']
+    aciklama = vi.acikla(user_data, diabetes_status=kayit['has_dm'], htn_status=kayit['has_htn'])
+    sonuc = dict(
+        kayit,
+        df_benzer=vi.get_benzer_kisiler(age=user_data['Age'], gender=user_data['Gender_Male'], limit=500),
+        etkiler_htn=aciklama['htn']['etkiler'],
+        etkiler_dm=aciklama['dm']['etkiler'],
+    )
+    sonuc['etkiler'] = sonuc['etkiler_dm'] if kayit['has_htn'] else sonuc['etkiler_htn']
+
+    # Senaryo başına bir figür: aynı tip art arda çizildiğinde eksenler ve stil yeniden kurulmaz
+    anahtar = (kayit['has_htn'], kayit['has_dm'])
+    grafik = _ISCI['grafikler'].get(anahtar)
+    if grafik is None:
+        grafik = _ISCI['grafikler'][anahtar] = GrafikOlusturucu(sabit_yerlesim=True)
+    grafik.ciz_analiz_sonucu(sonuc)
+    return grafik.resim()
+
+
+def _rapor_uret(is_):
+    """Süreç havuzunda çalışır: tek raporu yazar, (hasta, hata) döner."""
+    kayit, yol = is_
+    try:
+        rapor_yaz(kayit, yol, kayit['hasta'], grafik=_grafik(kayit))
+        return kayit['hasta'], None
+    except Exception as e:
+        return kayit['hasta'], str(e)
+
+
+def raporlari_uret(kayitlar, cikti_klasoru, islem=None, veri_yolu=None, grafikli=True):
+    """Sonuç kayıtlarını süreç havuzunda PDF'e çevirir. (başarılı, hatalar) döner."""
+    Path(cikti_klasoru).mkdir(parents=True, exist_ok=True)
+    isler = [(k, str(Path(cikti_klasoru) / ad)) for k, ad in _dosya_adlari(kayitlar)]
+    islem = islem or os.cpu_count() or 1
+    if islem == 1:
+        _isci_baslat(veri_yolu, grafikli)
+        return _say(map(_rapor_uret, isler))
+    with ProcessPoolExecutor(max_workers=islem, initializer=_isci_baslat,
+                             initargs=(veri_yolu, grafikli)) as havuz:
+        # Küçük parçalar halinde dağıtmak süreçler arası iletişim yükünü azaltır
+        parca = max(1, len(isler) // (islem * 4))
+        return _say(havuz.map(_rapor_uret, isler, chunksize=parca))
+
+
+def _dosya_adlari(kayitlar):
+    """Adı aynı dosya adına temizlenen hastalara _2, _3 ... ekler; raporlar birbirinin üzerine yazılmaz."""
+    kullanilan = set()
+    for kayit in kayitlar:
+        ad = rapor_dosya_adi(kayit['hasta'])
+        kok, uzanti = os.path.splitext(ad)
+        sira = 1
+        # Büyük/küçük harf duyarsız dosya sistemlerinde de çakışmasın
+        while ad.lower() in kullanilan:
+            sira += 1
+            ad = f"{kok}_{sira}{uzanti}"
+        kullanilan.add(ad.lower())
+        yield kayit, ad
+
+
+def _say(sonuclar):
+    basarili, hatalar = 0, []
+    for hasta, hata in sonuclar:
+        if hata is None:
+            basarili += 1
+        else:
+            hatalar.append((hasta, hata))
+    return basarili, hatalar
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tüm hastalar için PDF sağlık raporu üretir.")
+    parser.add_argument('kayitlar', nargs='?', help="Hasta kayıt klasörü (dosya adı = hasta adı)")
+    parser.add_argument('--skorlar', help="toplu_skor ile skorlanmış CSV dosyası (Hasta sütunu isteğe bağlı)")
+    parser.add_argument('-o', '--cikti', default='hasta_saglik_raporlari', help="Raporların yazılacağı klasör")
+    parser.add_argument('--veri', help="Eğitim veri seti yolu (varsayılan: data/hypertension_data.csv)")
+    parser.add_argument('--islem', type=int, help="Paralel süreç sayısı (varsayılan: işlemci sayısı)")
+    parser.add_argument('--grafiksiz', action='store_true', help="Raporlara grafik sayfası ekleme")
+    args = parser.parse_args(argv)
+
+    if not args.skorlar and not args.kayitlar:
+        parser.error("Kayıt klasörü ya da --skorlar verilmeli.")
+
+    veri_isleyici = None
+    if args.kayitlar and not args.skorlar or not args.grafiksiz:
+        # Süreçler başlamadan önce model önbelleği ve referans veri dosyası hazırlanır
+        with contextlib.redirect_stdout(sys.stderr):
+            veri_isleyici = VeriIsleyici(args.veri)
+        if veri_isleyici.model_htn is None:
+            print("Hata: Modeller hazırlanamadı (veri seti bulunamadı mı?)", file=sys.stderr)
+            return 1
+
+    if args.skorlar:
+        skorlar = pd.read_csv(args.skorlar)
+    else:
+        tablo = son_kayitlar(args.kayitlar)
+        if tablo.empty:
+            print("Hata: Klasörde kayıt bulunamadı.", file=sys.stderr)
+            return 1
+        skorlar = parcayi_skorla(veri_isleyici, tablo)
+
+    if 'Hasta' not in skorlar.columns:
+        skorlar = skorlar.assign(Hasta=[f"Hasta_{i + 1}" for i in range(len(skorlar))])
+    # Eksik değerli hastalar atlanır, diğerlerinin raporları yine de üretilir
+    skorlar, atlananlar = eksikleri_ayir(skorlar)
+    basarili, hatalar = raporlari_uret(sonuc_kayitlari(skorlar), args.cikti, args.islem,
+                                       veri_yolu=args.veri, grafikli=not args.grafiksiz)
+    hatalar = atlananlar + hatalar
+    for hasta, hata in hatalar:
+        print(f"Hata ({hasta}): {hata}", file=sys.stderr)
+    print(f"✅ {basarili} rapor oluşturuldu.", file=sys.stderr)
+    return 0 if not hatalar else 2
+
+
+if __name__ == '__main__':
+    sys.exit(main())
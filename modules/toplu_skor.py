@@ -0,0 +1,205 @@
+"""Ekransız toplu risk skorlama.
+
+Kayıt düzenindeki (``SysBP``, ``DiaBP``, ``Seker``, ``Tuz_Gr``, ``Sigara`` ...)
+hasta dosyasını parça parça okur, analiz_yap ile aynı dönüşümlerden geçirir,
+iki modeli vektörel olarak skorlar ve sonuçları akış halinde yazar. Boş ya da
+sayı olmayan hücreler eğitimdeki gibi imputer ortalamalarıyla doldurulur ve
+``Eksik_Alanlar`` sütununda listelenir; zorunlu bir sütun hiç yoksa dosya skorlanmaz.
+tkinter içe aktarılmaz; cron ile sunucularda çalıştırılabilir.
+
+    python -m modules.toplu_skor hastalar.csv -o skorlar.csv
+"""
+import argparse
+import contextlib
+import sys
+
+import numpy as np
+import pandas as pd
+
+from modules.veri_isleme import VeriIsleyici, SIGARA_KODLARI, aktivite_seviyesi
+
+# Kayıt sütunu -> model özelliği (birebir kopyalananlar)
+SUTUN_ESLEME = {
+    'Yas': 'Age',
+    'BMI': 'BMI',
+    'SysBP': 'Systolic_BP',
+    'DiaBP': 'Diastolic_BP',
+    'Kolesterol': 'Cholesterol',
+    'LDL': 'LDL',
+    'HDL': 'HDL',
+    'Trigliserit': 'Triglycerides',
+    'Seker': 'Glucose',
+    'Nabiz': 'Heart_Rate',
+    'Tuz_Gr': 'Salt_Intake',
+    'Uyku': 'Sleep_Duration',
+}
+
+# Model özelliği -> kayıt sütunu (eksik alan raporu için)
+OZELLIK_KAYNAKLARI = {
+    **{hedef: kaynak for kaynak, hedef in SUTUN_ESLEME.items()},
+    'Alcohol_Intake': 'Alkol',
+    'Physical_Activity_Level': 'Aktivite',
+    'Gender_Male': 'Cinsiyet',
+    'Smoking_Num': 'Sigara',
+    'Family_History_Num': 'Aile_Oykusu',
+}
+# Girdide bulunması gereken sütunlar (BMI yoksa Kilo ve Boy'dan hesaplanır)
+ZORUNLU_SUTUNLAR = list(OZELLIK_KAYNAKLARI.values())
+
+CINSIYET_KODLARI = {"Erkek": 1, "Kadın": 0}
+EVET_HAYIR_KODLARI = {"Evet": 1, "Hayır": 0}
+
+SENARYO_ACIKLAMA = {
+    1: "Hipertansiyon var - Diyabet riski",
+    2: "Diyabet var - Tansiyon riski",
+    3: "İkisi de yok - İki risk",
+    4: "İkisi de var - Sağlık yönetimi",
+}
+
+
+class EksikSutunHatasi(ValueError):
+    """Girdide zorunlu bir sütun yok; dosya skorlanmaz."""
+
+
+def _evet_mi(seri):
+    return seri.astype(str).str.strip().eq("Evet").to_numpy()
+
+
+def _sayi(df, sutun):
+    if sutun not in df.columns:
+        return pd.Series(np.nan, index=df.index)
+    return pd.to_numeric(df[sutun], errors='coerce').astype(np.float64)
+
+
+def _kod(df, sutun, kodlar):
+    if sutun not in df.columns:
+        return pd.Series(np.nan, index=df.index)
+    return df[sutun].astype(str).str.strip().map(kodlar).astype(np.float64)
+
+
+def eksik_sutunlar(sutunlar):
+    """Girdide bulunmayan zorunlu sütunları döner."""
+    sutunlar = set(sutunlar)
+    if {'Kilo', 'Boy'} <= sutunlar:
+        sutunlar.add('BMI')
+    return [s for s in ZORUNLU_SUTUNLAR if s not in sutunlar]
+
+
+def kayitlari_donustur(df):
+    """Kayıt düzenindeki tabloyu model özelliklerine çevirir (analiz_yap ile aynı kurallar).
+
+    Boş, sayı olmayan ya da tanınmayan değerler NaN olarak kalır.
+    """
+    X = pd.DataFrame(index=df.index)
+    for kaynak, hedef in SUTUN_ESLEME.items():
+        X[hedef] = _sayi(df, kaynak)
+    if 'BMI' not in df.columns:
+        X['BMI'] = _sayi(df, 'Kilo') / ((_sayi(df, 'Boy') / 100) ** 2)
+
+    X['Alcohol_Intake'] = _sayi(df, 'Alkol') * 7.0
+    dakika = _sayi(df, 'Aktivite')
+    X['Physical_Activity_Level'] = np.where(dakika.isna(), np.nan, aktivite_seviyesi(dakika.to_numpy()))
+    X['Gender_Male'] = _kod(df, 'Cinsiyet', CINSIYET_KODLARI)
+    X['Smoking_Num'] = _kod(df, 'Sigara', SIGARA_KODLARI)
+    X['Family_History_Num'] = _kod(df, 'Aile_Oykusu', EVET_HAYIR_KODLARI)
+    return X
+
+
+def _eksik_alanlar(eksik):
+    """Her satır için NaN olan özelliklerin kayıt sütunu adlarını virgülle birleştirir."""
+    adlar = np.array([OZELLIK_KAYNAKLARI[c] for c in eksik.columns], dtype=object)
+    M = eksik.to_numpy()
+    sonuc = np.full(len(M), "", dtype=object)
+    for i in np.flatnonzero(M.any(axis=1)):
+        sonuc[i] = ", ".join(adlar[M[i]])
+    return sonuc
+
+
+def parcayi_skorla(veri_isleyici, df):
+    """Bir parçadaki her hasta için senaryoyu ve riskleri hesaplar.
+
+    Eksik değerler eğitimdeki imputer ortalamalarıyla doldurulur; hangi alanların
+    doldurulduğu ``Eksik_Alanlar`` sütununa yazılır (boşsa kayıt eksiksizdir).
+    """
+    X = kayitlari_donustur(df)
+    eksik = X.isna()
+    X = veri_isleyici.eksikleri_doldur(X)
+    has_htn = _evet_mi(df['Hipertansiyon']) if 'Hipertansiyon' in df.columns else np.zeros(len(df), dtype=bool)
+    has_dm = _evet_mi(df['Diyabet']) if 'Diyabet' in df.columns else np.zeros(len(df), dtype=bool)
+
+    # Mevcut hastalık, diğer modelin durum girdisidir; zaten var olan hastalığın riski hesaplanmaz
+    risk_htn = np.where(has_htn, 0.0, veri_isleyici.tahmin_et_htn_batch(X, diabetes_status=has_dm))
+    risk_dm = np.where(has_dm, 0.0, veri_isleyici.tahmin_et_dm_batch(X, htn_status=has_htn))
+    senaryo = np.select([has_htn & ~has_dm, ~has_htn & has_dm, ~has_htn & ~has_dm], [1, 2, 3], 4)
+
+    sonuc = df.copy()
+    sonuc['Senaryo'] = senaryo
+    sonuc['Senaryo_Aciklama'] = pd.Series(senaryo, index=df.index).map(SENARYO_ACIKLAMA)
+    sonuc['Risk_HTN'] = risk_htn.round(1)
+    sonuc['Risk_DM'] = risk_dm.round(1)
+    sonuc['Risk_Skoru'] = np.maximum(risk_htn, risk_dm).round(1)
+    sonuc['Eksik_Alanlar'] = _eksik_alanlar(eksik)
+    return sonuc
+
+
+def parcalari_oku(yol, parca_boyutu):
+    if str(yol).lower().endswith('.parquet'):
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(yol).iter_batches(batch_size=parca_boyutu):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(yol, chunksize=parca_boyutu)
+
+
+def calistir(girdi, cikti, veri_isleyici, parca_boyutu=50000):
+    """Girdiyi parça parça skorlar, her parçayı hemen çıktıya ekler.
+
+    (skorlanan, eksik alanı doldurulan) satır sayılarını döner. Zorunlu sütun
+    eksikse ilk parçada EksikSutunHatasi fırlatılır, çıktıya hiçbir şey yazılmaz.
+    """
+    toplam, eksikli = 0, 0
+    for i, parca in enumerate(parcalari_oku(girdi, parca_boyutu)):
+        if i == 0:
+            eksik = eksik_sutunlar(parca.columns)
+            if eksik:
+                raise EksikSutunHatasi(f"Girdide zorunlu sütunlar yok: {', '.join(eksik)}")
+        sonuc = parcayi_skorla(veri_isleyici, parca)
+        sonuc.to_csv(cikti, index=False, header=(i == 0))
+        toplam += len(parca)
+        eksikli += int((sonuc['Eksik_Alanlar'] != "").sum())
+    return toplam, eksikli
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Hasta kayıtlarını toplu olarak HTN / DM riski için skorlar.")
+    parser.add_argument('girdi', help="Kayıt düzeninde CSV ya da Parquet dosyası")
+    parser.add_argument('-o', '--cikti', help="Sonuç CSV dosyası (verilmezse standart çıktı)")
+    parser.add_argument('--veri', help="Eğitim veri seti yolu (varsayılan: data/hypertension_data.csv)")
+    parser.add_argument('--parca', type=int, default=50000, help="Parça başına satır sayısı")
+    args = parser.parse_args(argv)
+
+    # Eğitim mesajları standart çıktıya akan CSV'yi bozmasın
+    with contextlib.redirect_stdout(sys.stderr):
+        veri_isleyici = VeriIsleyici(args.veri)
+    if veri_isleyici.model_htn is None:
+        print("Hata: Modeller hazırlanamadı (veri seti bulunamadı mı?)", file=sys.stderr)
+        return 1
+
+    try:
+        if args.cikti:
+            with open(args.cikti, 'w', newline='', encoding='utf-8') as f:
+                toplam, eksikli = calistir(args.girdi, f, veri_isleyici, args.parca)
+        else:
+            toplam, eksikli = calistir(args.girdi, sys.stdout, veri_isleyici, args.parca)
+    except EksikSutunHatasi as e:
+        print(f"Hata: {e}", file=sys.stderr)
+        return 1
+    print(f"✅ {toplam} kayıt skorlandı.", file=sys.stderr)
+    if eksikli:
+        print(f"⚠️ {eksikli} kayıtta eksik ya da geçersiz alanlar ortalamayla dolduruldu (Eksik_Alanlar sütunu).",
+              file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
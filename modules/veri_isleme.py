@@ -1,18 +1,124 @@
 import pandas as pd
 import numpy as np
+import sklearn
 from sklearn.linear_model import LogisticRegression
 from sklearn.preprocessing import StandardScaler
 from sklearn.impute import SimpleImputer
 import os
+import pickle
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
+from scipy.special import expit
+
+from modules.izleme import aralik, izle
+
+# Model önbelleği: şema veya veri seti değişince otomatik olarak yeniden eğitilir
+ONBELLEK_SURUMU = 5
+ONBELLEK_DOSYASI = 'model_onbellek.pkl'
+# Temizlenmiş referans veri (özellikler + hedefler); süreçler arasında mmap ile paylaşılır
+REFERANS_DOSYASI = 'referans_veri.npy'
+# Parçalı eğitimde benzer kişi aramaları için bellekte tutulan en fazla satır
+REFERANS_ORNEKLEM = 200000
+# Tekrarlanan analizler için bellekte tutulan en fazla sonuç sayısı
+TAHMIN_ONBELLEK_BOYUTU = 256
+# Önbellek anahtarında girdiler bu kadar ondalığa yuvarlanır (BMI gibi hesaplanan değerler için)
+ANAHTAR_HASSASIYETI = 3
+# Referans veride int8 olarak saklanan kod sütunları
+KOD_SUTUNLARI = {'Physical_Activity_Level', 'Gender_Male', 'Smoking_Num', 'Family_History_Num', 'Target_HTN', 'Target_DM'}
+
+# Arayüzdeki seçimlerin model kodları (analiz_yap ve toplu skorlama aynı tabloyu kullanır)
+SIGARA_KODLARI = {"İçmiyor": 0, "Bırakmış": 1, "İçiyor": 2}
+# Günlük aktivite dakikası -> 1-4 seviyesi (Dataset uyumu için): <30, <60, <90, 90+
+AKTIVITE_SINIRLARI = [30, 60, 90]
+
+# Etki analizinde gösterilen Türkçe etiketler
+ETKI_ETIKETLERI = {
+    'Age': 'Yaş', 'BMI': 'Kilo (BMI)', 'Systolic_BP': 'Büyük Tansiyon',
+    'Diastolic_BP': 'Küçük Tansiyon', 'Cholesterol': 'Kolesterol', 'LDL': 'LDL',
+    'HDL': 'HDL', 'Triglycerides': 'Trigliserit', 'Glucose': 'Şeker',
+    'Heart_Rate': 'Nabız', 'Salt_Intake': 'Tuz', 'Alcohol_Intake': 'Alkol',
+    'Sleep_Duration': 'Uyku', 'Physical_Activity_Level': 'Hareketsizlik',
+    'Gender_Male': 'Cinsiyet', 'Smoking_Num': 'Sigara', 'Family_History_Num': 'Genetik',
+    'Target_DM': 'Diyabet Hastalığı', 'Target_HTN': 'Tansiyon Hastalığı'
+}
+
+def aktivite_seviyesi(dakika):
+    """Dakikayı 1-4 arası aktivite seviyesine çevirir; sayı ya da dizi kabul eder."""
+    return np.searchsorted(AKTIVITE_SINIRLARI, dakika, side='right') + 1
+
+
+def _kategorik_donustur(seri, siniflandir):
+    """Kuralı sadece benzersiz değerlere uygular, sonucu kodlarla tüm satırlara yayar.
+
+    object sütunlarda True, 1 ve 1.0 aynı hash'e düştüğü için factorize onları
+    birleştirir; eski kurallar değerleri str() ile gördüğünden önce metne çevrilir.
+    """
+    if seri.dtype == object:
+        seri = seri.astype(str)
+    kodlar, benzersiz = pd.factorize(seri, use_na_sentinel=False)
+    metin = pd.Series(benzersiz, dtype=object).astype(str).str.lower()
+    return pd.Series(np.asarray(siniflandir(metin), dtype=np.int64)[kodlar], index=seri.index)
+
+
+def _icerir(metin, *kelimeler):
+    sonuc = np.zeros(len(metin), dtype=bool)
+    for k in kelimeler:
+        sonuc |= metin.str.contains(k, regex=False, na=False).to_numpy(dtype=bool)
+    return sonuc
+
+
+def _cinsiyet_kodu(m):
+    erkek = _icerir(m, 'male') & ~_icerir(m, 'female')
+    return np.where(erkek | (m.str.strip() == '1').to_numpy(dtype=bool), 1, 0)
+
+
+def _sigara_kodu(m):
+    return np.select([_icerir(m, 'current', 'smoker', 'yes'), _icerir(m, 'former', 'past')], [2, 1], 0)
+
+
+def _evet_kodu(m):
+    return np.where(_icerir(m, 'yes', '1', 'true'), 1, 0)
+
+
+def _aktivite_kodu(m):
+    return np.select([_icerir(m, 'low'), _icerir(m, 'moderate'), _icerir(m, 'high')], [1, 2, 3], 2)
+
+
+def _htn_kodu(m):
+    return np.where(_icerir(m, 'high', 'yes', '1'), 1, 0)
+
 
 class VeriIsleyici:
-    def __init__(self):
+    def __init__(self, veri_yolu=None, onbellek=True, parca_boyutu=None,
+                 tahmin_onbellek_boyutu=TAHMIN_ONBELLEK_BOYUTU):
         self.model_htn = None 
         self.model_dm = None  
         self.scaler_htn = StandardScaler()
         self.scaler_dm = StandardScaler()
         self.imputer = SimpleImputer(strategy='mean') 
         self.df = None
+        self._hizli = {}
+        self._kohort = None
+        self.bellek_raporu = None
+        self.onbellek = onbellek
+        # Son analiz sonuçları (LRU); modeller yeniden eğitilince boşaltılır
+        self.tahmin_onbellek_boyutu = tahmin_onbellek_boyutu
+        self._tahmin_onbellegi = OrderedDict()
+        self._tahmin_kilidi = threading.Lock()
+        self._tahmin_nesli = 0
+        self.tahmin_isabet = 0
+        self.tahmin_iskalama = 0
+        # Verilirse veri seti bu kadar satırlık parçalarla okunur (bellek dostu eğitim)
+        self.parca_boyutu = parca_boyutu
+
+        if veri_yolu is None:
+            base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            veri_yolu = os.path.join(base_dir, 'data', 'hypertension_data.csv')
+        self.veri_yolu = veri_yolu
+        self.onbellek_yolu = os.path.join(os.path.dirname(veri_yolu), ONBELLEK_DOSYASI)
+        self.referans_yolu = os.path.join(os.path.dirname(veri_yolu), REFERANS_DOSYASI)
         
         self.features = [
             'Age', 'BMI', 'Systolic_BP', 'Diastolic_BP', 
@@ -25,92 +131,346 @@ class VeriIsleyici:
         
         self.egit()
 
-    def egit(self):
+    # ---------------------------------------------------------
+    # MODEL ÖNBELLEĞİ (Her açılışta yeniden eğitmemek için)
+    # ---------------------------------------------------------
+    def _dosya_ozeti(self, file_path):
+        h = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for blok in iter(lambda: f.read(1 << 20), b''):
+                h.update(blok)
+        return h.hexdigest()
+
+    def _kutuphane_surumleri(self):
+        return {'sklearn': sklearn.__version__, 'numpy': np.__version__}
+
+    @izle('onbellek_yukle')
+    def _onbellek_yukle(self, file_path):
+        """Önbellek geçerliyse modelleri diskten yükler, değilse False döner."""
+        if not self.onbellek or not os.path.exists(self.onbellek_yolu):
+            return False
         try:
-            base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-            file_path = os.path.join(base_dir, 'data', 'hypertension_data.csv')
+            with open(self.onbellek_yolu, 'rb') as f:
+                paket = pickle.load(f)
+        except Exception as e:
+            print(f"Önbellek okunamadı: {e}")
+            return False
+
+        if paket.get('surum') != ONBELLEK_SURUMU or paket.get('features') != self.features:
+            return False
+        # Kütüphane güncellenince eski sürümle pickle'lanmış modeller yeniden eğitilir
+        if paket.get('kutuphaneler') != self._kutuphane_surumleri():
+            return False
+
+        st = os.stat(file_path)
+        iz = paket.get('parmak_izi', {})
+        if iz.get('boyut') != st.st_size:
+            return False
+        # Boyut ve zaman aynıysa dosyayı tekrar okumaya gerek yok
+        if iz.get('mtime') != st.st_mtime_ns and iz.get('sha256') != self._dosya_ozeti(file_path):
+            return False
+
+        self.imputer = paket['imputer']
+        self.scaler_htn = paket['scaler_htn']
+        self.scaler_dm = paket['scaler_dm']
+        self.model_htn = paket['model_htn']
+        self.model_dm = paket['model_dm']
+        ref = paket['referans']
+        try:
+            self.df = self._referans_ac(ref['sutunlar'], ref['satir'], ref['tipler'])
+        except Exception as e:
+            print(f"Referans veri açılamadı: {e}")
+            return False
+        self.bellek_raporu = self._onbellek_bellek_raporu(paket.get('bellek_raporu'))
+        return True
+
+    def _onbellek_bellek_raporu(self, egitim_raporu):
+        """Önbellekten açılan tablonun bu süreçteki bellek kullanımı.
+
+        ``paylasimli_bayt`` mmap'ten okunan (süreçler arasında paylaşılan) sütunlar,
+        ``sonra_bayt`` bu sürecin kendi belleğine kopyalanan int8 sütunlardır.
+        ``once_bayt`` eğitimin yapıldığı süreçte ölçülmüştür.
+        """
+        paylasimli = sum(self.df[c].nbytes for c in self.df.columns if self.df[c].dtype == np.float32)
+        return {
+            'kaynak': 'onbellek',
+            'satir': len(self.df),
+            'once_bayt': (egitim_raporu or {}).get('once_bayt'),
+            'sonra_bayt': int(self.df.memory_usage(deep=True).sum()) - paylasimli,
+            'paylasimli_bayt': paylasimli,
+        }
+
+    @izle('onbellek_kaydet')
+    def _onbellek_kaydet(self, file_path):
+        if not self.onbellek:
+            return
+        st = os.stat(file_path)
+        paket = {
+            'surum': ONBELLEK_SURUMU,
+            'features': list(self.features),
+            'kutuphaneler': self._kutuphane_surumleri(),
+            'parmak_izi': {
+                'boyut': st.st_size,
+                'mtime': st.st_mtime_ns,
+                'sha256': self._dosya_ozeti(file_path),
+            },
+            'imputer': self.imputer,
+            'scaler_htn': self.scaler_htn,
+            'scaler_dm': self.scaler_dm,
+            'model_htn': self.model_htn,
+            'model_dm': self.model_dm,
+            'referans': {'sutunlar': list(self.df.columns), 'satir': len(self.df),
+                         'tipler': {c: str(t) for c, t in self.df.dtypes.items()}},
+            'bellek_raporu': self.bellek_raporu,
+        }
+        # Aynı anda açılan uygulamalar yarım dosya görmesin diye önce geçici dosyaya yaz
+        gecici = f"{self.onbellek_yolu}.{os.getpid()}.tmp"
+        try:
+            # Önce referans matris, en son paket: paket yazıldıysa matris de hazırdır
+            self._referans_yaz()
+            with open(gecici, 'wb') as f:
+                pickle.dump(paket, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(gecici, self.onbellek_yolu)
+        except Exception as e:
+            print(f"Önbellek yazılamadı: {e}")
+            if os.path.exists(gecici):
+                os.remove(gecici)
+
+    # ---------------------------------------------------------
+    # PAYLAŞIMLI REFERANS VERİ (mmap ile açılan sabit düzenli .npy)
+    # ---------------------------------------------------------
+    def _referans_yaz(self):
+        """self.df'i sütun öncelikli float32 bir .npy dosyasına yazar.
+
+        Sütunlar bellekte ardışık olduğu için dosya mmap ile açıldığında pandas
+        kopyalamadan kullanır; aynı makinedeki tüm süreçler aynı sayfa önbelleğini paylaşır.
+        """
+        gecici = f"{self.referans_yolu}.{os.getpid()}.tmp"
+        try:
+            M = np.lib.format.open_memmap(gecici, mode='w+', dtype=np.float32,
+                                          shape=self.df.shape, fortran_order=True)
+            M[:] = self.df.to_numpy(dtype=np.float32)
+            M.flush()
+            del M
+            os.replace(gecici, self.referans_yolu)
+        finally:
+            if os.path.exists(gecici):
+                os.remove(gecici)
+
+    def _referans_ac(self, sutunlar, satir, tipler):
+        """Matrisi mmap ile açar; float32 sütunlar dosyayı paylaşır, kod sütunları int8'e geri çevrilir."""
+        M = np.load(self.referans_yolu, mmap_mode='r')
+        if M.shape != (satir, len(sutunlar)):
+            raise ValueError("Referans veri boyutu önbellekle uyuşmuyor.")
+        df = pd.DataFrame(M, columns=sutunlar, copy=False)
+        # Sadece dönüştürülen sütunlar kopyalanır; diğerleri mmap'i göstermeye devam eder
+        for col, tip in tipler.items():
+            if np.dtype(tip) != np.float32:
+                df[col] = df[col].to_numpy().astype(tip)
+        return df
+
+    # ---------------------------------------------------------
+    # VERİ TEMİZLEME (Satır satır apply yerine vektörel)
+    # ---------------------------------------------------------
+    @izle('veri_temizle')
+    def _veri_temizle(self, df):
+        """Ham veri setindeki kategorik sütunları modelin beklediği sayısal kodlara çevirir."""
+        if 'Gender' in df.columns:
+            df['Gender_Male'] = _kategorik_donustur(df['Gender'], _cinsiyet_kodu)
+        else: df['Gender_Male'] = 0
+
+        if 'Smoking_Status' in df.columns:
+            df['Smoking_Num'] = _kategorik_donustur(df['Smoking_Status'], _sigara_kodu)
+        else: df['Smoking_Num'] = 0
+
+        if 'Family_History' in df.columns:
+            df['Family_History_Num'] = _kategorik_donustur(df['Family_History'], _evet_kodu)
+        else: df['Family_History_Num'] = 0
+
+        if 'Physical_Activity_Level' in df.columns:
+            df['Physical_Activity_Level'] = _kategorik_donustur(df['Physical_Activity_Level'], _aktivite_kodu)
+
+        if 'BMI' not in df.columns and 'Weight' in df.columns:
+            df['BMI'] = df['Weight'] / ((df['Height']/100)**2)
+
+        if 'Hypertension' in df.columns:
+            df['Target_HTN'] = _kategorik_donustur(df['Hypertension'], _htn_kodu)
+        else:
+            df['Target_HTN'] = (pd.to_numeric(df['Systolic_BP']) >= 140).astype(np.int64)
+
+        if 'Diabetes' in df.columns:
+            df['Target_DM'] = _kategorik_donustur(df['Diabetes'], _evet_kodu)
+        else:
+            df['Target_DM'] = (pd.to_numeric(df['Glucose']) >= 126).astype(np.int64)
+
+        return df
+
+    def _sayisallastir(self, df):
+        for col in self.features:
+            if col not in df.columns: df[col] = 0
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+        return df
+
+    # ---------------------------------------------------------
+    # PARÇALI (BELLEĞE SIĞMAYAN VERİ İÇİN) EĞİTİM
+    # ---------------------------------------------------------
+    def _parcalar(self, file_path):
+        """CSV'yi parça parça temizlenmiş halde okur (ayraç ilk satırlardan belirlenir)."""
+        sep = ','
+        if len(pd.read_csv(file_path, nrows=5).columns) < 2:
+            sep = ';'
+        for parca in pd.read_csv(file_path, sep=sep, chunksize=self.parca_boyutu):
+            parca.columns = parca.columns.str.strip()
+            self._veri_temizle(parca)
+            yield self._sayisallastir(parca)
+
+    @izle('akista_egit')
+    def _akista_egit(self, file_path):
+        """Veriyi hiçbir zaman tamamen belleğe almadan imputer, ölçekleyiciler ve modelleri kurar.
+
+        1. geçiş: ortalamalar ve satır sayısı. 2. geçiş: eksikler doldurulur,
+        ölçekleyiciler partial_fit ile beslenir ve sayısal matris diskte geçici bir
+        memmap'e yazılır. Modeller bu matris üzerinde parçalı gradyanla L-BFGS ile
+        çözülür; sonuç LogisticRegression(class_weight='balanced') ile aynı amacı
+        optimize eder. Benzer kişiler için sadece rastgele bir referans örneklem tutulur.
+        """
+        d = len(self.features)
+        toplam, adet, n = np.zeros(d), np.zeros(d), 0
+        for parca in self._parcalar(file_path):
+            X = parca[self.features].to_numpy(dtype=np.float64)
+            toplam += np.nansum(X, axis=0)
+            adet += np.sum(~np.isnan(X), axis=0)
+            n += len(parca)
+        if n == 0:
+            return False
+        ortalama = np.divide(toplam, adet, out=np.full(d, np.nan), where=adet > 0)
+        # SimpleImputer'ı ortalamalardan oluşan tek satırla kurmak, istatistiklerini birebir verir
+        self.imputer.fit(pd.DataFrame([ortalama], columns=self.features))
+
+        # partial_fit önceki eğitimin (ya da yarım kalan önbellek yüklemesinin) istatistiklerine eklemesin
+        self.scaler_htn = StandardScaler()
+        self.scaler_dm = StandardScaler()
+        rng = np.random.default_rng(42)
+        oran = min(1.0, REFERANS_ORNEKLEM / n)
+        ornekler = []
+        with tempfile.TemporaryDirectory() as gecici:
+            M = np.lib.format.open_memmap(os.path.join(gecici, 'X.npy'), mode='w+',
+                                          dtype=np.float64, shape=(n, d + 2))
+            i = 0
+            for parca in self._parcalar(file_path):
+                parca[self.features] = self.imputer.transform(parca[self.features])
+                self.scaler_htn.partial_fit(parca[self.features + ['Target_DM']])
+                self.scaler_dm.partial_fit(parca[self.features + ['Target_HTN']])
+                M[i:i + len(parca), :d] = parca[self.features].to_numpy(dtype=np.float64)
+                M[i:i + len(parca), d] = parca['Target_DM'].to_numpy()
+                M[i:i + len(parca), d + 1] = parca['Target_HTN'].to_numpy()
+                i += len(parca)
+                ornekler.append(parca[rng.random(len(parca)) < oran])
+            M.flush()
+            self.df = pd.concat(ornekler, ignore_index=True)
+
+            # HTN modeli: özellikler + Target_DM -> Target_HTN ; DM modeli: özellikler + Target_HTN -> Target_DM
+            self.model_htn = self._parcali_lojistik(M, d, d + 1, self.scaler_htn)
+            self.model_dm = self._parcali_lojistik(M, d + 1, d, self.scaler_dm)
+            del M
+        return True
+
+    def _parcali_lojistik(self, M, durum_sutunu, hedef_sutunu, scaler, C=1.0):
+        n, d = M.shape[0], M.shape[1] - 2
+        blok = self.parca_boyutu
+        y_tum = M[:, hedef_sutunu]
+        siniflar, sayilar = np.unique(y_tum, return_counts=True)
+        if len(siniflar) != 2:
+            raise ValueError("Hedef değişkende iki sınıf bulunmalı.")
+        # class_weight='balanced': n / (2 * sınıf_sayısı)
+        agirlik = n / (2.0 * sayilar)
+
+        def amac(theta):
+            w, b = theta[:-1], theta[-1]
+            kayip, gw, gb = 0.0, np.zeros(d + 1), 0.0
+            for bas in range(0, n, blok):
+                B = M[bas:bas + blok]
+                X = np.column_stack([B[:, :d], B[:, durum_sutunu]])
+                X = (X - scaler.mean_) / scaler.scale_
+                y = B[:, hedef_sutunu]
+                sw = np.where(y == siniflar[1], agirlik[1], agirlik[0])
+                z = X @ w + b
+                kayip += np.dot(sw, np.logaddexp(0.0, z) - y * z)
+                fark = sw * (expit(z) - y)
+                gw += X.T @ fark
+                gb += fark.sum()
+            # sklearn ile aynı amaç: C * Σ sw·logloss + ½‖w‖² (n'ye bölmek sadece ölçeği değiştirir)
+            f = (C * kayip + 0.5 * np.dot(w, w)) / n
+            g = np.append(C * gw + w, C * gb) / n
+            return f, g
+
+        from scipy.optimize import minimize  # Sadece parçalı eğitimde gerekli
+
+        sonuc = minimize(amac, np.zeros(d + 2), jac=True, method='L-BFGS-B',
+                         options={'maxiter': 5000, 'gtol': 1e-8})
+        model = LogisticRegression(max_iter=5000, class_weight='balanced')
+        model.classes_ = siniflar.astype(np.int64)
+        model.coef_ = sonuc.x[:-1].reshape(1, -1)
+        model.intercept_ = sonuc.x[-1:].copy()
+        model.n_features_in_ = d + 1
+        model.n_iter_ = np.array([sonuc.nit], dtype=np.int32)
+        return model
+
+    @izle('egit')
+    def egit(self, zorla=False):
+        self.tahmin_onbellegini_temizle()
+        try:
+            file_path = self.veri_yolu
             
             if not os.path.exists(file_path):
                 return False
 
-            try:
-                self.df = pd.read_csv(file_path)
-                if len(self.df.columns) < 2:
-                    self.df = pd.read_csv(file_path, sep=';')
-            except Exception as e:
-                print(f"Hata: {e}")
-                return False
+            if not zorla and self._onbellek_yukle(file_path):
+                self._hizli_yol_hazirla()
+                self._kohort_indeksi_hazirla()
+                print("✅ Modeller önbellekten yüklendi.")
+                return True
 
-            self.df.columns = self.df.columns.str.strip()
-
-            # Dönüşümler
-            if 'Gender' in self.df.columns:
-                self.df['Gender_Male'] = self.df['Gender'].astype(str).apply(
-                    lambda x: 1 if 'male' in x.lower() and 'female' not in x.lower() else (1 if x.strip() == '1' else 0)
-                )
-            else: self.df['Gender_Male'] = 0
-
-            if 'Smoking_Status' in self.df.columns:
-                def clean_smoke(x):
-                    s = str(x).lower()
-                    if 'current' in s or 'smoker' in s or 'yes' in s: return 2
-                    if 'former' in s or 'past' in s: return 1
-                    return 0
-                self.df['Smoking_Num'] = self.df['Smoking_Status'].apply(clean_smoke)
-            else: self.df['Smoking_Num'] = 0
-
-            if 'Family_History' in self.df.columns:
-                self.df['Family_History_Num'] = self.df['Family_History'].astype(str).apply(
-                    lambda x: 1 if 'yes' in x.lower() or '1' in x or 'true' in x.lower() else 0
-                )
-            else: self.df['Family_History_Num'] = 0
-
-            if 'Physical_Activity_Level' in self.df.columns:
-                def map_activity(x):
-                    s = str(x).lower()
-                    if 'low' in s: return 1
-                    elif 'moderate' in s: return 2
-                    elif 'high' in s: return 3
-                    return 2
-                self.df['Physical_Activity_Level'] = self.df['Physical_Activity_Level'].apply(map_activity)
-
-            if 'BMI' not in self.df.columns and 'Weight' in self.df.columns:
-                self.df['BMI'] = self.df['Weight'] / ((self.df['Height']/100)**2)
-
-            if 'Hypertension' in self.df.columns:
-                self.df['Target_HTN'] = self.df['Hypertension'].astype(str).apply(
-                    lambda x: 1 if 'high' in x.lower() or 'yes' in x.lower() or '1' in x else 0
-                )
+            if self.parca_boyutu:
+                if not self._akista_egit(file_path):
+                    return False
             else:
-                self.df['Target_HTN'] = self.df['Systolic_BP'].apply(lambda x: 1 if float(x) >= 140 else 0)
+                try:
+                    with aralik('veri_oku'):
+                        self.df = pd.read_csv(file_path)
+                        if len(self.df.columns) < 2:
+                            self.df = pd.read_csv(file_path, sep=';')
+                except Exception as e:
+                    print(f"Hata: {e}")
+                    return False
 
-            if 'Diabetes' in self.df.columns:
-                self.df['Target_DM'] = self.df['Diabetes'].astype(str).apply(
-                    lambda x: 1 if 'yes' in x.lower() or '1' in x or 'true' in x.lower() else 0
-                )
-            else:
-                self.df['Target_DM'] = self.df['Glucose'].apply(lambda x: 1 if float(x) >= 126 else 0)
+                self.df.columns = self.df.columns.str.strip()
 
-            for col in self.features:
-                if col not in self.df.columns: self.df[col] = 0
-                self.df[col] = pd.to_numeric(self.df[col], errors='coerce')
-            
-            self.df[self.features] = self.imputer.fit_transform(self.df[self.features])
-
-            # HTN Modeli
-            X_htn = self.df[self.features + ['Target_DM']]
-            y_htn = self.df['Target_HTN']
-            self.scaler_htn.fit(X_htn)
-            self.model_htn = LogisticRegression(max_iter=5000, class_weight='balanced')
-            self.model_htn.fit(self.scaler_htn.transform(X_htn), y_htn)
-            
-            # DM Modeli
-            X_dm = self.df[self.features + ['Target_HTN']]
-            y_dm = self.df['Target_DM']
-            self.scaler_dm.fit(X_dm)
-            self.model_dm = LogisticRegression(max_iter=5000, class_weight='balanced')
-            self.model_dm.fit(self.scaler_dm.transform(X_dm), y_dm)
+                self._veri_temizle(self.df)
+                self._sayisallastir(self.df)
+                
+                self.df[self.features] = self.imputer.fit_transform(self.df[self.features])
+
+                # HTN Modeli
+                X_htn = self.df[self.features + ['Target_DM']]
+                y_htn = self.df['Target_HTN']
+                with aralik('model_htn'):
+                    self.scaler_htn.fit(X_htn)
+                    self.model_htn = LogisticRegression(max_iter=5000, class_weight='balanced')
+                    self.model_htn.fit(self.scaler_htn.transform(X_htn), y_htn)
+                
+                # DM Modeli
+                X_dm = self.df[self.features + ['Target_HTN']]
+                y_dm = self.df['Target_DM']
+                with aralik('model_dm'):
+                    self.scaler_dm.fit(X_dm)
+                    self.model_dm = LogisticRegression(max_iter=5000, class_weight='balanced')
+                    self.model_dm.fit(self.scaler_dm.transform(X_dm), y_dm)
             
+            self._referans_sikistir()
+            self._onbellek_kaydet(file_path)
+            self._hizli_yol_hazirla()
+            self._kohort_indeksi_hazirla()
             print("✅ Modeller hazır.")
             return True
 
@@ -118,94 +478,268 @@ class VeriIsleyici:
             print(f"Hata: {e}")
             return False
 
+    # ---------------------------------------------------------
+    # REFERANS VERİ (Eğitimden sonra bellekte tutulan kompakt kopya)
+    # ---------------------------------------------------------
+    @izle('referans_sikistir')
+    def _referans_sikistir(self):
+        """self.df'i sadece özellikler ve hedeflerle sınırlar, tipleri küçültür.
+
+        Ham metin sütunları atılır; tam sayı kodlar int8, ölçümler float32 tutulur.
+        Eğitimden önceki ve sonraki bellek kullanımı ``self.bellek_raporu`` içine yazılır.
+        """
+        once = int(self.df.memory_usage(deep=True).sum())
+        kompakt = {}
+        for col in self.features + ['Target_HTN', 'Target_DM']:
+            deger = self.df[col].to_numpy()
+            if col in KOD_SUTUNLARI and np.array_equal(deger, np.round(deger)):
+                kompakt[col] = deger.astype(np.int8)
+            else:
+                kompakt[col] = deger.astype(np.float32)
+        self.df = pd.DataFrame(kompakt, index=pd.RangeIndex(len(self.df)))
+        sonra = int(self.df.memory_usage(deep=True).sum())
+        self.bellek_raporu = {'satir': len(self.df), 'once_bayt': once, 'sonra_bayt': sonra}
+        print(f"ℹ️ Referans veri: {once / 2**20:.1f} MB -> {sonra / 2**20:.1f} MB")
+
+    # ---------------------------------------------------------
+    # BENZER KİŞİLER İNDEKSİ (Her analizde tüm tabloyu taramamak için)
+    # ---------------------------------------------------------
+    @izle('kohort_indeksi')
+    def _kohort_indeksi_hazirla(self):
+        """Satırları (cinsiyet, yaş) ve sadece yaşa göre sıralı tutar; aralıklar searchsorted ile bulunur."""
+        self._kohort = None
+        if self.df is None or self.df.empty: return
+        yas = self.df['Age'].to_numpy(dtype=np.float64)
+        cinsiyet = self.df['Gender_Male'].to_numpy()
+
+        sira_yas = np.argsort(yas, kind='stable')
+        sira_cy = np.lexsort((yas, cinsiyet))
+        gruplar = {}
+        cinsiyet_sirali = cinsiyet[sira_cy]
+        for g in np.unique(cinsiyet_sirali):
+            bas = np.searchsorted(cinsiyet_sirali, g, side='left')
+            son = np.searchsorted(cinsiyet_sirali, g, side='right')
+            gruplar[g] = (bas, son)
+
+        self._kohort = {
+            'sira_yas': sira_yas, 'yas_sirali': yas[sira_yas],
+            'sira_cy': sira_cy, 'yas_cy': yas[sira_cy], 'gruplar': gruplar,
+        }
+
+    def _yas_araligi(self, yaslar, bas, son, age, genislik):
+        alt = bas + np.searchsorted(yaslar[bas:son], age - genislik, side='left')
+        ust = bas + np.searchsorted(yaslar[bas:son], age + genislik, side='right')
+        return alt, ust
+
+    @izle('kohort')
     def get_benzer_kisiler(self, age, gender, limit=500):
         if self.df is None: return None
-        df_filter = self.df[
-            (self.df['Age'] >= age - 5) & 
-            (self.df['Age'] <= age + 5) & 
-            (self.df['Gender_Male'] == gender)
-        ]
-        if len(df_filter) < 20:
-            df_filter = self.df[(self.df['Age'] >= age - 10) & (self.df['Age'] <= age + 10)]
-        return df_filter.sample(min(len(df_filter), limit), random_state=42) if not df_filter.empty else self.df.sample(limit)
+        return self._tahmin_onbellekten(('kohort', age, gender, limit),
+                                        lambda: self._benzer_kisileri_sec(age, gender, limit))
+
+    def _benzer_kisileri_sec(self, age, gender, limit):
+        if self._kohort is None: self._kohort_indeksi_hazirla()
+        k = self._kohort
+
+        sira, (alt, ust) = None, (0, 0)
+        if gender in k['gruplar']:
+            sira = k['sira_cy']
+            alt, ust = self._yas_araligi(k['yas_cy'], *k['gruplar'][gender], age, 5)
+        if ust - alt < 20:
+            sira = k['sira_yas']
+            alt, ust = self._yas_araligi(k['yas_sirali'], 0, len(sira), age, 10)
+        if ust == alt:
+            return self.df.sample(limit)
+
+        secim = np.random.default_rng(42).choice(ust - alt, size=min(ust - alt, limit), replace=False)
+        return self.df.iloc[np.sort(sira[alt + secim])]
+
+    # ---------------------------------------------------------
+    # TAHMİN ÖNBELLEĞİ (Aynı girdiyle tekrarlanan analizler için LRU)
+    # ---------------------------------------------------------
+    def _girdi_anahtari(self, user_dict):
+        return tuple(round(float(user_dict.get(f, 0)), ANAHTAR_HASSASIYETI) for f in self.features)
+
+    def _tahmin_onbellekten(self, anahtar, hesapla):
+        """Sonuç önbellekteyse onu, değilse hesaplayıp saklayarak döner.
+
+        Dönen nesneler paylaşılır; çağıran taraf değiştirmemelidir.
+        """
+        with self._tahmin_kilidi:
+            if anahtar in self._tahmin_onbellegi:
+                self._tahmin_onbellegi.move_to_end(anahtar)
+                self.tahmin_isabet += 1
+                return self._tahmin_onbellegi[anahtar]
+            self.tahmin_iskalama += 1
+            nesil = self._tahmin_nesli
+
+        sonuc = hesapla()
+        if self.tahmin_onbellek_boyutu > 0:
+            with self._tahmin_kilidi:
+                # Hesap sürerken modeller yeniden eğitildiyse eski sonuç saklanmaz
+                if nesil != self._tahmin_nesli:
+                    return sonuc
+                self._tahmin_onbellegi[anahtar] = sonuc
+                while len(self._tahmin_onbellegi) > self.tahmin_onbellek_boyutu:
+                    self._tahmin_onbellegi.popitem(last=False)
+        return sonuc
+
+    def tahmin_onbellegini_temizle(self):
+        with self._tahmin_kilidi:
+            self._tahmin_onbellegi.clear()
+            self._tahmin_nesli += 1
+
+    def tahmin_onbellek_durumu(self):
+        return {
+            'isabet': self.tahmin_isabet,
+            'iskalama': self.tahmin_iskalama,
+            'boyut': len(self._tahmin_onbellegi),
+            'kapasite': self.tahmin_onbellek_boyutu,
+        }
+
+    # ---------------------------------------------------------
+    # HIZLI TEK HASTA TAHMİNİ (DataFrame ve sklearn doğrulaması olmadan)
+    # ---------------------------------------------------------
+    def _hizli_yol_hazirla(self):
+        """Ölçekleyiciyi model ağırlıklarına gömer: z = w·x + b doğrudan ham girdiyle hesaplanır."""
+        self._hizli = {}
+        for hedef, model, scaler in (('htn', self.model_htn, self.scaler_htn), ('dm', self.model_dm, self.scaler_dm)):
+            if model is None: continue
+            w = model.coef_[0] / scaler.scale_
+            b = model.intercept_[0] - np.dot(w, scaler.mean_)
+            self._hizli[hedef] = (w, float(b))
+
+    def _tekil_vektor(self, user_dict, durum):
+        x = np.empty(len(self.features) + 1, dtype=np.float64)
+        for i, f in enumerate(self.features):
+            x[i] = float(user_dict.get(f, 0))
+        x[-1] = 1.0 if durum else 0.0
+        return x
+
+    def _hizli_olasilik(self, hedef, user_dict, durum):
+        w, b = self._hizli[hedef]
+        z = float(np.dot(w, self._tekil_vektor(user_dict, durum))) + b
+        return float(expit(z)) * 100
 
-    # --- (DataFrame Kullanarak Uyarıyı Çözer) ---
     def tahmin_et_htn(self, user_dict, diabetes_status):
         if not self.model_htn: return 0.0
-        
-        # Veriyi DataFrame olarak hazırla
-        input_data = {f: float(user_dict.get(f, 0)) for f in self.features}
-        input_data['Target_DM'] = 1 if diabetes_status else 0
-        df_input = pd.DataFrame([input_data])
-        
-        # Sütun sırasını garantiye al
-        X = df_input[self.features + ['Target_DM']]
-        
-        scaled = self.scaler_htn.transform(X)
-        return self.model_htn.predict_proba(scaled)[0][1] * 100
+        return self._hizli_olasilik('htn', user_dict, diabetes_status)
 
     def tahmin_et_dm(self, user_dict, htn_status):
         if not self.model_dm: return 0.0
-        
-        input_data = {f: float(user_dict.get(f, 0)) for f in self.features}
-        input_data['Target_HTN'] = 1 if htn_status else 0
-        df_input = pd.DataFrame([input_data])
-        
-        X = df_input[self.features + ['Target_HTN']]
-        
-        scaled = self.scaler_dm.transform(X)
-        return self.model_dm.predict_proba(scaled)[0][1] * 100
+        return self._hizli_olasilik('dm', user_dict, htn_status)
 
-    def get_etki_analizi(self, user_dict, target='htn', existing_condition=0):
-        if target == 'htn':
-            model = self.model_htn
-            scaler = self.scaler_htn
-            feature_order = self.features + ['Target_DM']
-            col_condition = 'Target_DM'
-            feat_names_out = self.features + ['Mevcut Diyabet']
+    # ---------------------------------------------------------
+    # TOPLU TAHMİN (Çok sayıda hasta için tek geçişte)
+    # ---------------------------------------------------------
+    def _girdi_matrisi(self, veri, durum):
+        """DataFrame ya da (N, özellik) matrisini, durum sütunu eklenmiş float matrise çevirir."""
+        if isinstance(veri, pd.DataFrame):
+            X = np.zeros((len(veri), len(self.features) + 1), dtype=np.float64)
+            for i, f in enumerate(self.features):
+                if f in veri.columns:
+                    X[:, i] = veri[f].to_numpy(dtype=np.float64)
         else:
-            model = self.model_dm
-            scaler = self.scaler_dm
-            feature_order = self.features + ['Target_HTN']
-            col_condition = 'Target_HTN'
-            feat_names_out = self.features + ['Mevcut Hipertansiyon']
-            
-        if not model: return {}
+            veri = np.asarray(veri, dtype=np.float64)
+            if veri.ndim != 2 or veri.shape[1] != len(self.features):
+                raise ValueError(f"Girdi matrisi (N, {len(self.features)}) boyutunda olmalı.")
+            X = np.empty((veri.shape[0], len(self.features) + 1), dtype=np.float64)
+            X[:, :-1] = veri
+        X[:, -1] = np.asarray(durum, dtype=bool)
+        return X
 
-        input_data = {f: float(user_dict.get(f, 0)) for f in self.features}
-        input_data[col_condition] = existing_condition
-        df_input = pd.DataFrame([input_data])
-        X = df_input[feature_order]
+    def eksikleri_doldur(self, X):
+        """Özellik tablosundaki boş değerleri eğitimdeki gibi imputer ortalamalarıyla doldurur."""
+        return X.fillna(dict(zip(self.features, self.imputer.statistics_)))
 
-        row_scaled = scaler.transform(X)[0]
-        coefs = model.coef_[0]
-        
-        etkiler = {}
-        label_map = {
-            'Age': 'Yaş', 'BMI': 'Kilo (BMI)', 'Systolic_BP': 'Büyük Tansiyon',
-            'Diastolic_BP': 'Küçük Tansiyon', 'Cholesterol': 'Kolesterol', 'LDL': 'LDL',
-            'HDL': 'HDL', 'Triglycerides': 'Trigliserit', 'Glucose': 'Şeker',
-            'Heart_Rate': 'Nabız', 'Salt_Intake': 'Tuz', 'Alcohol_Intake': 'Alkol',
-            'Sleep_Duration': 'Uyku', 'Physical_Activity_Level': 'Hareketsizlik',
-            'Gender_Male': 'Cinsiyet', 'Smoking_Num': 'Sigara', 'Family_History_Num': 'Genetik',
-            'Mevcut Diyabet': 'Diyabet Hastalığı', 'Mevcut Hipertansiyon': 'Tansiyon Hastalığı',
-            'Target_DM': 'Diyabet Hastalığı', 'Target_HTN': 'Tansiyon Hastalığı'
+    def _toplu_olasilik(self, model, scaler, X):
+        scaled = (X - scaler.mean_) / scaler.scale_
+        return model.predict_proba(scaled)[:, 1] * 100
+
+    def tahmin_et_htn_batch(self, veri, diabetes_status):
+        """Her hasta için hipertansiyon riskini (%) dizi olarak döner."""
+        if not self.model_htn: return np.zeros(len(veri))
+        X = self._girdi_matrisi(veri, diabetes_status)
+        return self._toplu_olasilik(self.model_htn, self.scaler_htn, X)
+
+    def tahmin_et_dm_batch(self, veri, htn_status):
+        """Her hasta için diyabet riskini (%) dizi olarak döner."""
+        if not self.model_dm: return np.zeros(len(veri))
+        X = self._girdi_matrisi(veri, htn_status)
+        return self._toplu_olasilik(self.model_dm, self.scaler_dm, X)
+
+    def tahmin_et_batch(self, veri, diabetes_status=0, htn_status=0):
+        """İki riski birlikte hesaplar; girdi DataFrame ise aynı indeksle döner."""
+        index = veri.index if isinstance(veri, pd.DataFrame) else None
+        return pd.DataFrame({
+            'Risk_HTN': self.tahmin_et_htn_batch(veri, diabetes_status),
+            'Risk_DM': self.tahmin_et_dm_batch(veri, htn_status),
+        }, index=index)
+
+    # ---------------------------------------------------------
+    # ETKİ ANALİZİ (Özellik katkıları: coef_ * ölçeklenmiş girdi)
+    # ---------------------------------------------------------
+    def _etki_vektoru(self, hedef, X):
+        """Ölçeklenmiş girdinin her sütununun logit'e katkısı; X tek satır ya da (N, F+1) olabilir."""
+        if hedef == 'htn':
+            model, scaler = self.model_htn, self.scaler_htn
+        else:
+            model, scaler = self.model_dm, self.scaler_dm
+        return model.coef_[0] * ((X - scaler.mean_) / scaler.scale_)
+
+    def _etki_sutunlari(self, hedef):
+        return self.features + ['Target_DM' if hedef == 'htn' else 'Target_HTN']
+
+    def _etki_sozlugu(self, hedef, etki):
+        return {
+            ETKI_ETIKETLERI.get(ad, ad): float(deger)
+            for ad, deger in zip(self._etki_sutunlari(hedef), etki)
+            if abs(deger) > 0.001
         }
 
-        for i, val in enumerate(row_scaled):
-            if i < len(coefs):
-                impact = val * coefs[i]
-                if abs(impact) > 0.001: 
-                    # Sütun ismini bul
-                    if i < len(self.features):
-                        raw_name = self.features[i]
-                    else:
-                        raw_name = col_condition
-                    
-                    name = label_map.get(raw_name, raw_name)
-                    etkiler[name] = impact
-        
-        return etkiler
+    @izle('acikla')
+    def acikla(self, user_dict, diabetes_status=0, htn_status=0):
+        """Tek hasta için iki hedefin riskini (%) ve etki sözlüğünü aynı girdi vektöründen hesaplar.
+
+        Dönüş: {'htn': {'risk': ..., 'etkiler': {...}}, 'dm': {...}}
+        """
+        anahtar = ('acikla', self._girdi_anahtari(user_dict), bool(diabetes_status), bool(htn_status))
+        return self._tahmin_onbellekten(anahtar, lambda: self._acikla(user_dict, diabetes_status, htn_status))
+
+    def _acikla(self, user_dict, diabetes_status, htn_status):
+        x = self._tekil_vektor(user_dict, 0)
+        sonuc = {}
+        for hedef, model, durum in (('htn', self.model_htn, diabetes_status), ('dm', self.model_dm, htn_status)):
+            if not model:
+                sonuc[hedef] = {'risk': 0.0, 'etkiler': {}}
+                continue
+            x[-1] = 1.0 if durum else 0.0
+            etki = self._etki_vektoru(hedef, x)
+            z = float(etki.sum() + model.intercept_[0])
+            sonuc[hedef] = {'risk': float(expit(z)) * 100, 'etkiler': self._etki_sozlugu(hedef, etki)}
+        return sonuc
+
+    @izle('etki_analizi')
+    def get_etki_analizi(self, user_dict, target='htn', existing_condition=0):
+        model = self.model_htn if target == 'htn' else self.model_dm
+        if not model: return {}
+        anahtar = ('etki', target, self._girdi_anahtari(user_dict), bool(existing_condition))
+        return self._tahmin_onbellekten(anahtar, lambda: self._etki_sozlugu(
+            target, self._etki_vektoru(target, self._tekil_vektor(user_dict, existing_condition))))
+
+    def get_etki_analizi_batch(self, veri, target='htn', existing_condition=0):
+        """Her hasta için özellik katkılarını (N, F+1) DataFrame olarak döner.
+
+        Sütunlar ham özellik adlarıdır (etiketler için ETKI_ETIKETLERI); satır toplamı
+        ile modelin sabit terimi o hastanın logit değerini verir.
+        """
+        model = self.model_htn if target == 'htn' else self.model_dm
+        index = veri.index if isinstance(veri, pd.DataFrame) else None
+        sutunlar = self._etki_sutunlari(target)
+        if not model:
+            return pd.DataFrame(0.0, index=index if index is not None else range(len(veri)), columns=sutunlar)
+        etki = self._etki_vektoru(target, self._girdi_matrisi(veri, existing_condition))
+        return pd.DataFrame(etki, index=index, columns=sutunlar)
 
     def get_dataframe(self):
         return self.df
\ No newline at end of file